@@ -5,7 +5,7 @@ a = Analysis(
     ['dog_instance.py'],
     pathex=[],
     binaries=[],
-    datas=[('assets', 'assets'), ('schnauzer_art.py', '.'), ('schnauzer_settings.json', '.')],
+    datas=[('assets', 'assets'), ('schnauzer_art.bin', '.'), ('schnauzer_settings.json', '.')],
     hiddenimports=['pygame'],
     hookspath=[],
     hooksconfig={},
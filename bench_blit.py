@@ -0,0 +1,46 @@
+"""
+Benchmark blitting frames in their loaded pixel format vs the display format
+
+Frames straight from disk (or the baked-frame cache) are in whatever format
+the file had, so every blit converts pixels on the fly. After
+SchauzerSprites.convert_for_display() they match the window and blits are
+a straight copy.
+
+Usage: python bench_blit.py [results.json]
+"""
+import sys
+
+import bench_util
+import dog_instance
+from dog_instance import SchauzerSprites
+
+
+def main():
+    with bench_util.isolated():
+        # Load before any window exists so the frames keep their file format
+        loaded = {name: list(frames) for name, frames in SchauzerSprites.load_animations().items()}
+
+        dog = dog_instance.Dog(100, 100)  # Opens the window, which converts the shared frames
+        screen = dog.screen
+        results = {}
+
+        for state in SchauzerSprites.MIRRORED_STATES:
+            for label, frames in (('loaded', loaded[state]), ('display', dog.animations[state])):
+                counter = [0]
+
+                def blit():
+                    counter[0] += 1
+                    screen.blit(frames[counter[0] % len(frames)], (0, 0))
+
+                results[f"blit {state} {label} format"] = bench_util.measure(blit, rounds=2000)
+
+    sample = loaded['idle'][0]
+    print(f"Loaded frames: {sample.get_bitsize()} bit, masks {sample.get_masks()}")
+    print(f"Display frames: {dog.animations['idle'][0].get_bitsize()} bit, masks {dog.animations['idle'][0].get_masks()}")
+    bench_util.print_table(results)
+    if len(sys.argv) > 1:
+        bench_util.write_json(sys.argv[1], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark Dog.draw facing right vs left
+
+Left-facing dogs index into a pre-mirrored bank, so steady-state draw cost
+should match right-facing dogs. The "per-frame flip" rows show what the old
+draw path (pygame.transform.flip on every frame) cost for comparison.
+
+Usage: python bench_draw.py [results.json]
+"""
+import sys
+
+import bench_util
+import pygame
+import dog_instance
+
+
+def main():
+    with bench_util.isolated():
+        dog_instance.SchauzerSprites.load_animations()  # Everything loaded up front
+        dog = dog_instance.Dog(100, 100)
+        results = {}
+
+        for state in dog_instance.SchauzerSprites.MIRRORED_STATES:
+            for direction, label in ((1, 'right'), (-1, 'left')):
+                dog.state = state
+                dog.direction = direction
+                dog.frame = 0
+
+                def draw():
+                    dog.frame += 1
+                    dog.last_presented = None  # Time a real redraw, not the unchanged-frame skip
+                    dog.draw()
+
+                results[f"draw {state} {label}"] = bench_util.measure(draw)
+
+            # Old behaviour: flip a fresh surface every frame when facing left
+            frames = dog.animations[state]
+            counter = [0]
+
+            def flip_per_frame():
+                counter[0] += 1
+                frame_img = pygame.transform.flip(frames[counter[0] % len(frames)], True, False)
+                dog.screen.fill(dog_instance.TRANSPARENT)
+                dog.screen.blit(frame_img, (0, 0))
+                pygame.display.flip()
+
+            results[f"draw {state} left (per-frame flip)"] = bench_util.measure(flip_per_frame)
+
+    bench_util.print_table(results)
+    if len(sys.argv) > 1:
+        bench_util.write_json(sys.argv[1], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark the sprite and draw path, headless
+
+Times SchauzerSprites.get_disk_frame cold (atlas decode, source PNGs) and
+warm, every create_*_frames builder from the atlas and from the source
+files, Dog.draw for every state and direction, and schnauzer_art.draw_frame
+at several scales, cold and warm.
+
+Usage: python bench_render.py [results.json] [baseline.json]
+
+With a baseline (results.json of an earlier version) each median is also
+shown next to the old one.
+"""
+import sys
+
+import bench_util
+import pygame
+import dog_instance
+import schnauzer_art
+
+Sprites = dog_instance.SchauzerSprites
+BUILDERS = ['idle', 'walk', 'sit', 'backflip', 'poop', 'portal_out', 'portal_in']
+ART_SCALES = [1, 2, 3, 4]
+
+
+def forget_frames(use_atlas=True):
+    """Back to a cold start: nothing decoded, nothing built"""
+    Sprites.USE_ATLAS = use_atlas
+    Sprites._atlas = None
+    Sprites._baked = {}
+    Sprites._frame_cache.clear()
+    Sprites._raw_cache.clear()
+
+
+def bench_draw(dog, results):
+    for state in Sprites.LOAD_ORDER:
+        for direction, label in ((1, 'right'), (-1, 'left')):
+            dog.state = state
+            dog.direction = direction
+            dog.frame = 0
+
+            def draw():
+                dog.frame = (dog.frame + 1) % len(dog.animations[state])
+                dog.last_presented = None  # Time a real redraw, not the unchanged-frame skip
+                dog.draw()
+
+            results[f"Dog.draw {state} {label}"] = bench_util.measure(draw)
+    dog.state = 'idle'
+
+
+def bench_disk_frames(results):
+    def cold_from_atlas():
+        forget_frames()
+        Sprites.get_disk_frame('walk_3')
+
+    def cold_from_source():
+        forget_frames(use_atlas=False)
+        Sprites.get_disk_frame('walk_3')
+
+    results["get_disk_frame cold (atlas decode)"] = bench_util.measure(cold_from_atlas, rounds=20, warmup=2)
+    results["get_disk_frame cold (source png)"] = bench_util.measure(cold_from_source, rounds=50, warmup=2)
+
+    forget_frames()
+    Sprites.get_disk_frame('walk_3')
+    results["get_disk_frame warm"] = bench_util.measure(lambda: Sprites.get_disk_frame('walk_3'), rounds=5000)
+
+
+def bench_builders(results):
+    for name in BUILDERS:
+        builder = getattr(Sprites, f"create_{name}_frames")
+
+        # Atlas decoded once (as after the first frame), built frames forgotten
+        forget_frames()
+        Sprites.get_atlas_frames()
+
+        def from_atlas():
+            Sprites._frame_cache.clear()
+            builder()
+
+        def from_source():
+            forget_frames(use_atlas=False)
+            builder()
+
+        results[f"create_{name}_frames (atlas)"] = bench_util.measure(from_atlas, rounds=50, warmup=2)
+        results[f"create_{name}_frames (source)"] = bench_util.measure(from_source, rounds=10, warmup=1)
+    forget_frames()
+
+
+def bench_art(results):
+    surface = pygame.Surface((600, 600), pygame.SRCALPHA)
+    anim = schnauzer_art.frame_names()[0].rsplit('_', 1)[0]
+    for scale in ART_SCALES:
+        def cold():
+            schnauzer_art._surface_cache.clear()
+            schnauzer_art.draw_frame(surface, anim, 0, 0, 0, scale)
+
+        def warm():
+            schnauzer_art.draw_frame(surface, anim, 0, 0, 0, scale)
+
+        results[f"draw_frame x{scale} cold"] = bench_util.measure(cold, rounds=100)
+        results[f"draw_frame x{scale} warm"] = bench_util.measure(warm)
+
+
+def main():
+    with bench_util.isolated():
+        Sprites.load_animations()  # Everything loaded up front
+        dog = dog_instance.Dog(100, 100)
+        results = {}
+
+        bench_draw(dog, results)
+        bench_disk_frames(results)
+        bench_builders(results)
+        bench_art(results)
+
+    bench_util.print_table(results)
+    if len(sys.argv) > 2:
+        print()
+        bench_util.print_comparison(results, sys.argv[2])
+    if len(sys.argv) > 1:
+        bench_util.write_json(sys.argv[1], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Measure how CPU, memory and frame time grow with the number of dogs (Linux)
+
+For 1, 5, 20 and 100 dogs, and for each way of running them:
+- processes: one `dog_instance.py x y` each, the launcher's default;
+- zygote: one resident `--zygote` forking every dog (see run_zygote);
+- host: every dog in one `--host N` process;
+
+starts them headless (dummy video driver, temporary bus and log folders),
+waits until every dog has drawn, then watches them for a fixed window.
+Per process CPU time and memory come from /proc: RSS counts shared pages
+in every process, PSS splits them fairly, so its total is the real cost.
+Frame time is what the main loops report over the control bus (LoopStats):
+busy ms per loop, and the achieved interval while something moves
+(FRAME_MS when keeping up).
+
+Usage: python bench_scaling.py [window seconds] [results.json] [counts, e.g. 1,5,20]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import bench_util
+import control_bus
+import zone_table
+
+DOG_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dog_instance.py")
+COUNTS = [1, 5, 20, 100]
+MODES = ['processes', 'zygote', 'host']
+START_TIMEOUT = 120  # Seconds for every dog of a run to show up
+TICK = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+
+def cpu_seconds(pid):
+    """User + system CPU time of a process so far, None once it is gone"""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / TICK  # utime, stime
+
+
+def memory_kb(pid):
+    """(RSS, PSS) of a process in KB, zeros once it is gone"""
+    values = {}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                name, _, rest = line.partition(':')
+                if name in ('Rss', 'Pss'):
+                    values[name] = int(rest.split()[0])
+    except OSError:
+        pass
+    return values.get('Rss', 0), values.get('Pss', 0)
+
+
+def bus_peers(pids):
+    """Registration of every listed pid that joined the bus"""
+    return {peer['pid']: peer for peer in control_bus.registrations() if peer['pid'] in pids}
+
+
+def wait_until_shown(pids, count, key):
+    """Wait for count dogs, over all pids, to have drawn; returns their bus registrations"""
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        peers = bus_peers(pids)
+        shown = 0
+        for peer in peers.values():
+            reply = control_bus.send(peer, {'command': 'info'}, key) or {}
+            shown += sum(1 for dog in reply.get('dogs', []) if dog.get('shown'))
+        if shown >= count:
+            return peers
+        time.sleep(0.2)
+    raise RuntimeError(f"only some of {count} dogs showed up within {START_TIMEOUT} s")
+
+
+def start(mode, count, key):
+    """Start count dogs; returns (Popen objects to wait for, pids that run dogs, every pid)"""
+    if mode == 'host':
+        process = subprocess.Popen([sys.executable, DOG_SCRIPT, '--host', str(count)],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return [process], [process.pid], [process.pid]
+    if mode == 'processes':
+        processes = [subprocess.Popen([sys.executable, DOG_SCRIPT, str(100 + 7 * i), '300'],
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                     for i in range(count)]
+        pids = [process.pid for process in processes]
+        return processes, pids, pids
+
+    zygote = subprocess.Popen([sys.executable, DOG_SCRIPT, '--zygote'],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + START_TIMEOUT
+    while zygote.pid not in bus_peers([zygote.pid]):
+        if time.monotonic() > deadline:
+            raise RuntimeError("the zygote never joined the bus")
+        time.sleep(0.05)
+    peer = bus_peers([zygote.pid])[zygote.pid]
+    pids = []
+    for i in range(count):
+        reply = control_bus.send(peer, {'command': 'spawn', 'x': 100 + 7 * i, 'y': 300}, key)
+        if reply and reply.get('ok'):
+            pids.append(reply['pid'])
+    return [zygote], pids, pids + [zygote.pid]
+
+
+def stop(processes, peers, key):
+    for peer in peers.values():
+        control_bus.send(peer, {'command': 'close'}, key)
+    for peer in control_bus.registrations():
+        if peer.get('kind') == 'zygote':
+            control_bus.send(peer, {'command': 'close'}, key)
+    for process in processes:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+    # Forked dogs aren't our children; give them a moment to go
+    deadline = time.monotonic() + 10
+    while any(control_bus.pid_alive(pid) for pid in peers) and time.monotonic() < deadline:
+        time.sleep(0.1)
+
+
+def loop_stats(peers, key):
+    stats = {}
+    for pid, peer in peers.items():
+        reply = control_bus.send(peer, {'command': 'info'}, key) or {}
+        stats[pid] = reply.get('loop', {})
+    return stats
+
+
+def measure(mode, count, window, key):
+    processes, dog_pids, all_pids = start(mode, count, key)
+    try:
+        peers = wait_until_shown(dog_pids, count, key)
+        time.sleep(2)  # Past the startup work
+
+        cpu_before = {pid: cpu_seconds(pid) or 0.0 for pid in all_pids}
+        loops_before = loop_stats(peers, key)
+        started = time.monotonic()
+        rss, pss = [], []
+        while time.monotonic() - started < window:
+            memory = [memory_kb(pid) for pid in all_pids]
+            rss.append(sum(m[0] for m in memory))
+            pss.append(sum(m[1] for m in memory))
+            time.sleep(min(1.0, window / 5))
+        elapsed = time.monotonic() - started
+        cpu = [max(0.0, (cpu_seconds(pid) or 0.0) - cpu_before[pid]) for pid in all_pids]
+        loops_after = loop_stats(peers, key)
+    finally:
+        stop(processes, bus_peers(dog_pids), key)
+
+    loops = frames = 0
+    busy_ms = frame_ms = 0.0
+    for pid, after in loops_after.items():
+        before = loops_before.get(pid, {})
+        loops += after.get('loops', 0) - before.get('loops', 0)
+        busy_ms += after.get('busy_ms', 0) - before.get('busy_ms', 0)
+        frames += after.get('frames', 0) - before.get('frames', 0)
+        frame_ms += after.get('frame_ms', 0) - before.get('frame_ms', 0)
+
+    return {
+        'processes': len(all_pids),
+        'cpu_percent': sum(cpu) / elapsed * 100,
+        'cpu_percent_per_dog': sum(cpu) / elapsed * 100 / count,
+        'cpu_percent_max_process': max(cpu) / elapsed * 100,
+        'rss_mb': max(rss) / 1024,
+        'pss_mb': max(pss) / 1024,
+        'pss_mb_per_dog': max(pss) / 1024 / count,
+        'busy_ms_per_loop': busy_ms / loops if loops else 0.0,
+        'frame_ms': frame_ms / frames if frames else 0.0,
+        'loops_per_second': loops / elapsed,
+    }
+
+
+def print_results(results):
+    print(f"{'mode':<10} {'dogs':>5} {'procs':>5} {'CPU %':>7} {'CPU %/dog':>9} {'RSS MB':>8} "
+          f"{'PSS MB':>8} {'PSS/dog':>8} {'busy ms':>8} {'frame ms':>8}")
+    for name, r in results.items():
+        mode, count = name.rsplit(' ', 1)
+        print(f"{mode:<10} {count:>5} {r['processes']:>5} {r['cpu_percent']:7.1f} {r['cpu_percent_per_dog']:9.2f} "
+              f"{r['rss_mb']:8.1f} {r['pss_mb']:8.1f} {r['pss_mb_per_dog']:8.1f} "
+              f"{r['busy_ms_per_loop']:8.3f} {r['frame_ms']:8.1f}")
+
+
+def main():
+    if not os.path.exists('/proc/self/smaps_rollup'):
+        print("Needs Linux /proc (smaps_rollup) to sample the processes")
+        return 1
+    window = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    counts = [int(c) for c in sys.argv[3].split(',')] if len(sys.argv) > 3 else COUNTS
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # Inherited by every dog
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        os.environ['SCHNAUZER_BUS_DIR'] = os.path.join(folder, 'bus')
+        os.environ['SCHNAUZER_LOG_DIR'] = os.path.join(folder, 'logs')
+        key = control_bus.auth_key()
+        for count in counts:
+            for mode in MODES:
+                print(f"{count} dogs, {mode}...", flush=True)
+                results[f"{mode} {count}"] = measure(mode, count, window, key)
+        zone_table.remove_table()  # The dogs' block for this temporary bus
+
+    print()
+    print_results(results)
+    if len(sys.argv) > 2:
+        bench_util.write_json(sys.argv[2], results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Benchmark spawn-to-first-frame latency: cold process vs zygote fork (Linux)
+
+Each round asks for a new dog and polls it over the control bus until it
+reports its first frame drawn, then closes it. A cold spawn starts a new
+interpreter the way Dog.spawn_new_dog did; a zygote spawn asks a resident
+`dog_instance.py --zygote` to fork one.
+
+Usage: python bench_spawn.py [rounds] [results.json]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import bench_util
+import control_bus
+import zone_table
+
+DOG_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dog_instance.py")
+
+
+def peer_for(pid, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for peer in control_bus.registrations():
+            if peer['pid'] == pid:
+                return peer
+        time.sleep(0.002)
+    raise RuntimeError(f"process {pid} never joined the bus")
+
+
+def wait_until_shown(pid, key):
+    peer = peer_for(pid)
+    while True:
+        reply = control_bus.send(peer, {'command': 'info'}, key)
+        if reply and reply.get('dogs') and reply['dogs'][0].get('shown'):
+            return
+        time.sleep(0.002)
+
+
+def cold_spawn(key):
+    process = subprocess.Popen([sys.executable, DOG_SCRIPT, '300', '300'],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    wait_until_shown(process.pid, key)
+    return process.pid, process
+
+
+def zygote_spawn(key):
+    reply = control_bus.send_to('zygote', {'command': 'spawn', 'x': 300, 'y': 300})
+    wait_until_shown(reply['pid'], key)
+    return reply['pid'], None
+
+
+def measure(spawn, rounds, key):
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        pid, process = spawn(key)
+        times.append((time.perf_counter() - start) * 1000)
+        control_bus.send(peer_for(pid), {'command': 'close'}, key)
+        if process is not None:
+            process.wait()
+        time.sleep(0.05)
+    return bench_util.summarize(times)
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    if not hasattr(os, 'fork'):
+        print("The zygote needs os.fork (Linux)")
+        return
+
+    with tempfile.TemporaryDirectory() as folder:
+        os.environ['SCHNAUZER_BUS_DIR'] = os.path.join(folder, 'bus')
+        os.environ['SCHNAUZER_LOG_DIR'] = os.path.join(folder, 'logs')
+        key = control_bus.auth_key()
+
+        results = {"spawn cold process": measure(cold_spawn, rounds, key)}
+
+        zygote = subprocess.Popen([sys.executable, DOG_SCRIPT, '--zygote'],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        peer = peer_for(zygote.pid)
+        try:
+            results["spawn zygote fork"] = measure(zygote_spawn, rounds, key)
+        finally:
+            control_bus.send(peer, {'command': 'close'}, key)
+            zygote.wait()
+        zone_table.remove_table()  # The dogs' block for this temporary bus
+
+    bench_util.print_table(results)
+    speedup = results["spawn cold process"]['median'] / results["spawn zygote fork"]['median']
+    print(f"Zygote spawns reach the first frame {speedup:.1f}x sooner (median)")
+    if len(sys.argv) > 2:
+        bench_util.write_json(sys.argv[2], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Small timing helpers shared by the bench_*.py scripts
+"""
+import contextlib
+import json
+import os
+import statistics
+import tempfile
+import time
+
+# Benchmarks run without a real display
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+FOLDERS = ['SCHNAUZER_BUS_DIR', 'SCHNAUZER_CACHE_DIR', 'SCHNAUZER_LOG_DIR']
+
+
+@contextlib.contextmanager
+def isolated():
+    """Run a benchmark's dogs on a temporary bus, cache and log folder
+
+    They stay off the user's running dogs, zone table and baked-frame cache;
+    the bus is shut down and the zone block removed afterwards.
+    """
+    import dog_instance
+    import zone_table
+
+    saved = {name: os.environ.get(name) for name in FOLDERS}
+    with tempfile.TemporaryDirectory() as folder:
+        for name in FOLDERS:
+            os.environ[name] = os.path.join(folder, name.split('_')[1].lower())
+        try:
+            yield folder
+        finally:
+            dog_instance.stop_control_bus()
+            zone_table.remove_table()
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+
+def measure(func, rounds=500, warmup=20):
+    """Call func repeatedly and return timing stats in milliseconds"""
+    for _ in range(warmup):
+        func()
+
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return summarize(times)
+
+
+def summarize(times):
+    """Timing stats for a list of durations in milliseconds"""
+    return {
+        'rounds': len(times),
+        'min': min(times),
+        'max': max(times),
+        'mean': statistics.mean(times),
+        'median': statistics.median(times),
+        'stddev': statistics.stdev(times) if len(times) > 1 else 0.0,
+    }
+
+
+def print_table(results):
+    """Print name -> stats results as an aligned table"""
+    width = max(len(name) for name in results)
+    print(f"{'benchmark'.ljust(width)}  {'mean ms':>10}  {'median ms':>10}  {'min ms':>10}")
+    for name, stats in results.items():
+        print(f"{name.ljust(width)}  {stats['mean']:10.4f}  {stats['median']:10.4f}  {stats['min']:10.4f}")
+
+
+def write_json(path, results):
+    """Save results so runs from different versions can be compared"""
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {path}")
+
+
+def print_comparison(results, baseline_path):
+    """Print each result's median against a JSON file from an earlier run"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    width = max(len(name) for name in results)
+    print(f"{'benchmark'.ljust(width)}  {'before ms':>10}  {'now ms':>10}  {'change':>8}")
+    for name, stats in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]['median']
+        change = (stats['median'] - before) / before * 100 if before else 0.0
+        print(f"{name.ljust(width)}  {before:10.4f}  {stats['median']:10.4f}  {change:+7.1f}%")
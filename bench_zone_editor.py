@@ -0,0 +1,73 @@
+"""
+Benchmark opening and closing the zone editor from a dog
+
+"separate window" is the normal path: the editor gets its own SDL window
+and the dog's window and converted frames stay alive. "replace display" is
+the fallback that quits the display, opens the editor full screen and then
+recreates the dog's window. Each round times:
+
+  open       right-click until the editor's first frame is presented
+  reappear   editor closed until the dog is drawn in its window again
+
+Usage: python bench_zone_editor.py [rounds] [results.json]
+"""
+import sys
+import time
+
+import bench_util
+import pygame
+import dog_instance
+from dog_instance import SchauzerSprites, ZoneEditor
+
+
+def separate_window(dog):
+    start = time.perf_counter()
+    editor = ZoneEditor(dog.visible_zones, dog.stay_on_top, separate_window=True)
+    editor.draw()
+    opened = time.perf_counter()
+
+    editor.close()
+    dog.last_presented = None
+    dog.draw()
+    return opened - start, time.perf_counter() - opened
+
+
+def replace_display(dog):
+    start = time.perf_counter()
+    SchauzerSprites.display_closing()
+    pygame.display.quit()
+    pygame.display.init()
+    editor = ZoneEditor(dog.visible_zones, dog.stay_on_top)
+    editor.draw()
+    opened = time.perf_counter()
+
+    pygame.display.init()
+    dog.create_window()
+    dog.draw()
+    return opened - start, time.perf_counter() - opened
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with bench_util.isolated():
+        SchauzerSprites.load_animations()
+        dog = dog_instance.Dog(100, 100)
+        results = {}
+
+        for label, cycle in (('separate window', separate_window), ('replace display', replace_display)):
+            cycle(dog)  # Warm up fonts and caches
+            opens, reappears = [], []
+            for _ in range(rounds):
+                opened, reappeared = cycle(dog)
+                opens.append(opened * 1000)
+                reappears.append(reappeared * 1000)
+            results[f"{label} open"] = bench_util.summarize(opens)
+            results[f"{label} reappear"] = bench_util.summarize(reappears)
+
+    bench_util.print_table(results)
+    if len(sys.argv) > 2:
+        bench_util.write_json(sys.argv[2], results)
+
+
+if __name__ == "__main__":
+    main()
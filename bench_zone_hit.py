@@ -0,0 +1,83 @@
+"""
+Benchmark zone editor hit testing with many zones
+
+Feeds synthetic mouse positions to the editor's grid lookup and to the old
+linear scan over every zone (three handle Rects plus a body Rect per zone
+per event), and times one drag step (the zone's grid entry is updated in
+place). Both lookups are checked to agree before timing.
+
+Usage: python bench_zone_hit.py [zone_count] [results.json]
+"""
+import random
+import sys
+
+import bench_util
+import pygame
+import dog_instance
+
+
+def make_zones(count, rng):
+    zones = []
+    for _ in range(count):
+        x1 = rng.randrange(0, dog_instance.SCREEN_WIDTH - 120)
+        x2 = min(dog_instance.SCREEN_WIDTH, x1 + rng.randrange(60, 400))
+        zones.append([x1, x2, rng.randrange(0, dog_instance.SCREEN_HEIGHT - 80), rng.randrange(30, 80)])
+    return zones
+
+
+def linear_hover(editor, pos):
+    """The editor's hover check before the grid"""
+    mx, my = pos
+    for i, zone in enumerate(editor.zones):
+        left_h, right_h, delete_btn = editor.get_handle_rects(i)
+        zone_body = pygame.Rect(zone[0], zone[2], zone[1] - zone[0], zone[3])
+        if left_h.collidepoint(mx, my):
+            return (i, 'left')
+        elif right_h.collidepoint(mx, my):
+            return (i, 'right')
+        elif zone_body.collidepoint(mx, my):
+            return (i, 'body')
+    return None
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rng = random.Random(12)
+    pygame.display.init()
+    editor = dog_instance.ZoneEditor(make_zones(count, rng))
+
+    points = [(rng.randrange(dog_instance.SCREEN_WIDTH), rng.randrange(dog_instance.SCREEN_HEIGHT)) for _ in range(1000)]
+    for pos in points:
+        assert editor.hit_test(pos) == linear_hover(editor, pos), pos
+
+    counter = [0]
+
+    def next_point():
+        counter[0] += 1
+        return points[counter[0] % len(points)]
+
+    results = {
+        f"hover linear scan ({count} zones)": bench_util.measure(lambda: linear_hover(editor, next_point()), rounds=2000),
+        f"hover grid ({count} zones)": bench_util.measure(lambda: editor.hit_test(next_point()), rounds=2000),
+        f"click grid ({count} zones)": bench_util.measure(lambda: editor.hit_test(next_point(), include_delete=True), rounds=2000),
+    }
+
+    # One drag step: move zone 0 a few pixels and re-file it
+    zone = editor.zones[0]
+
+    def drag_step():
+        counter[0] += 1
+        shift = 3 if counter[0] % 2 else -3
+        zone[0] += shift
+        zone[1] += shift
+        editor.update_zone(0)
+
+    results[f"drag step grid update ({count} zones)"] = bench_util.measure(drag_step, rounds=2000)
+
+    bench_util.print_table(results)
+    if len(sys.argv) > 2:
+        bench_util.write_json(sys.argv[2], results)
+
+
+if __name__ == "__main__":
+    main()
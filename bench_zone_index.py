@@ -0,0 +1,112 @@
+"""
+Benchmark dog zone queries with many zones
+
+Compares the old per-call scans over every zone (walk step, zone for x,
+teleport target, nearest walkable spot) with the compiled ZoneIndex, and
+checks both agree on which zone owns each x, whether a standing dog is
+inside a zone and how far the nearest walkable x is.
+
+Usage: python bench_zone_index.py [zone_count] [results.json]
+"""
+import random
+import sys
+
+import bench_util
+import dog_instance
+from dog_instance import PET_WIDTH, PET_HEIGHT, ZoneIndex
+
+
+def make_zones(count, rng):
+    # A few shelves per monitor, zones of random length along them
+    floors = [dog_instance.SCREEN_HEIGHT - 60 - 150 * i for i in range(4)]
+    zones = []
+    for _ in range(count):
+        x1 = rng.randrange(0, dog_instance.SCREEN_WIDTH - 250)
+        x2 = min(dog_instance.SCREEN_WIDTH, x1 + rng.randrange(150, 700))
+        zones.append([x1, x2, rng.choice(floors), 60])
+    return zones
+
+
+def linear_zone_for_x(zones, x):
+    """The walk / teleport scan before the index"""
+    for i, zone in enumerate(zones):
+        if len(zone) >= 4:
+            zone_start, zone_end = zone[0], zone[1]
+        else:
+            zone_start, zone_end = zone[0], zone[1]
+        if zone_start <= x <= zone_end - PET_WIDTH:
+            return i
+    return None
+
+
+def linear_on_floor(zones, x, stand_y):
+    return any(z[0] <= x <= z[1] - PET_WIDTH and z[2] + z[3] - PET_HEIGHT == stand_y for z in zones)
+
+
+def linear_nearest_distance(zones, x):
+    """Distance from x to the closest x any zone has room for, or None"""
+    distances = [max(z[0] - x, 0, x - (z[1] - PET_WIDTH)) for z in zones if z[0] <= z[1] - PET_WIDTH]
+    return min(distances) if distances else None
+
+
+def linear_teleport(zones, x):
+    current_zone_idx = linear_zone_for_x(zones, x)
+    available_zones = [i for i in range(len(zones)) if i != current_zone_idx]
+    if not available_zones:
+        available_zones = list(range(len(zones)))
+    new_zone = zones[random.choice(available_zones)]
+    zone_start, zone_end, zone_y, zone_height = new_zone[0], new_zone[1], new_zone[2], new_zone[3]
+    zone_width = zone_end - zone_start - PET_WIDTH
+    if zone_width > 100:
+        target_x = zone_start + random.randint(50, zone_width - 50)
+    else:
+        target_x = zone_start + zone_width // 2
+    return target_x, zone_y + zone_height - PET_HEIGHT
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    rng = random.Random(18)
+    zones = make_zones(count, rng)
+    index = ZoneIndex.compile(zones)
+    floors = sorted(set(z[2] + z[3] - PET_HEIGHT for z in zones))
+
+    xs = [rng.randrange(-50, dog_instance.SCREEN_WIDTH + 50) for _ in range(2000)]
+    for x in xs:
+        assert index.zone_for_x(x) == linear_zone_for_x(zones, x), x
+        for stand_y in floors:
+            assert index.on_floor(x, stand_y) == linear_on_floor(zones, x, stand_y), (x, stand_y)
+        nx, ny = index.nearest(x)
+        assert abs(nx - x) == linear_nearest_distance(zones, x), x
+        assert index.on_floor(nx, ny), x
+    print(f"{count} zones, {sum(len(s) for s, e in index.floors.values())} merged ranges on {len(floors)} floors")
+
+    counter = [0]
+
+    def next_x():
+        counter[0] += 1
+        return xs[counter[0] % len(xs)]
+
+    def next_floor():
+        return floors[counter[0] % len(floors)]
+
+    results = {
+        f"walk step linear scan ({count} zones)": bench_util.measure(lambda: linear_zone_for_x(zones, next_x()), rounds=5000),
+        f"walk step index ({count} zones)": bench_util.measure(
+            lambda: index.on_floor(next_x(), next_floor()) or index.stand_y_for_x(next_x()), rounds=5000),
+        f"teleport target linear ({count} zones)": bench_util.measure(lambda: linear_teleport(zones, next_x()), rounds=5000),
+        f"teleport target index ({count} zones)": bench_util.measure(
+            lambda: index.sample(exclude=index.zone_for_x(next_x())), rounds=5000),
+        f"nearest walkable linear ({count} zones)": bench_util.measure(
+            lambda: linear_nearest_distance(zones, next_x()), rounds=5000),
+        f"nearest walkable index ({count} zones)": bench_util.measure(lambda: index.nearest(next_x()), rounds=5000),
+        f"compile index ({count} zones)": bench_util.measure(lambda: ZoneIndex(tuple(map(tuple, zones))), rounds=50),
+    }
+
+    bench_util.print_table(results)
+    if len(sys.argv) > 2:
+        bench_util.write_json(sys.argv[2], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Pack every runtime frame into one sprite atlas
+
+Writes assets/atlas.png and assets/atlas.json (frame rects and anchors).
+Dogs then decode one PNG at startup instead of opening, decoding and
+padding each processed frame, compositing the portal frames and rotating
+the backflip. Run again after changing anything in assets/ (build_exe.py
+does this automatically); dogs ignore an atlas whose sources have changed.
+"""
+import os
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import json
+import pygame
+from dog_instance import SchauzerSprites, PET_WIDTH, PET_HEIGHT
+
+ATLAS_WIDTH = 800
+
+
+def pack(sizes, max_width):
+    """Shelf-pack (w, h) sizes, tallest first; returns positions and sheet size"""
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    positions = [None] * len(sizes)
+    x = y = shelf_height = 0
+    for i in order:
+        w, h = sizes[i]
+        if x + w > max_width:
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+        positions[i] = (x, y)
+        x += w
+        shelf_height = max(shelf_height, h)
+    return positions, (max_width, y + shelf_height)
+
+
+def main():
+    SchauzerSprites.USE_ATLAS = False
+
+    # Each frame is trimmed to its visible pixels; the anchor says where the
+    # trimmed cell goes inside the window-sized frame
+    frames = SchauzerSprites.baked_frames()
+    if SchauzerSprites._placeholders:
+        raise SystemExit("Some frames failed to build, atlas not written")
+    trims = [frame.get_bounding_rect() for name, frame in frames]
+    positions, sheet_size = pack([rect.size for rect in trims], ATLAS_WIDTH)
+
+    sheet = pygame.Surface(sheet_size, pygame.SRCALPHA)
+    sheet.fill((0, 0, 0, 0))
+    manifest = {
+        'frame_size': [PET_WIDTH, PET_HEIGHT],
+        'sources': SchauzerSprites.source_hashes(),  # Checked by content, see get_atlas_frames
+        'frames': {},
+    }
+    for (name, frame), trim, (x, y) in zip(frames, trims, positions):
+        # BLEND_RGBA_MAX onto the cleared sheet copies pixels exactly
+        sheet.blit(frame, (x, y), trim, special_flags=pygame.BLEND_RGBA_MAX)
+        manifest['frames'][name] = {
+            'rect': [x, y, trim.width, trim.height],
+            'anchor': [trim.x, trim.y],
+        }
+
+    pygame.image.save(sheet, SchauzerSprites.ATLAS_IMAGE)
+    with open(SchauzerSprites.ATLAS_MANIFEST, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"Packed {len(frames)} frames into {SchauzerSprites.ATLAS_IMAGE} ({sheet_size[0]}x{sheet_size[1]})")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
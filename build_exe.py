@@ -40,7 +40,7 @@ def build_executable():
         "--noconsole",
         "--onefile", 
         "--add-data=assets;assets",
-        "--add-data=schnauzer_art.py;.",
+        "--add-data=schnauzer_art.bin;.",
         "--add-data=schnauzer_settings.json;.",
         "--hidden-import=pygame",
         "--noconfirm",
@@ -64,7 +64,7 @@ def build_executable():
         "--windowed",
         "--onedir", 
         "--add-data=assets;assets",
-        "--add-data=schnauzer_art.py;.",
+        "--add-data=schnauzer_art.bin;.",
         "--add-data=schnauzer_settings.json;.",
         "--hidden-import=pygame",
         "--hidden-import=tkinter",
@@ -162,6 +162,14 @@ def main():
     # Clean previous builds
     clean_build()
     
+    # Pack the sprite atlas so dogs decode one image at startup
+    print("\nPacking sprite atlas...")
+    try:
+        subprocess.run([VENV_PYTHON, "build_atlas.py"], check=True)
+    except subprocess.CalledProcessError:
+        print("[ERROR] Sprite atlas build failed!")
+        return 1
+    
     # Build executable
     if not build_executable():
         return 1
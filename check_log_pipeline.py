@@ -0,0 +1,103 @@
+"""
+Check that a chatty dog never stalls on its output
+
+Starts a dog process the way the launcher used to (stdout and stderr are
+pipes nobody reads), runs its update loop for some simulated hours while
+it prints a line every 100 simulated ms and logs every AI decision, and
+checks that it finishes, that no single step stalled and that its log
+files stayed within the rotation cap.
+
+Usage: python check_log_pipeline.py [hours] [--without-pipeline]
+
+--without-pipeline skips dog_log.setup() in the child to show the old
+behaviour: it freezes in print() once the pipe buffer is full.
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import dog_log
+import zone_table
+
+STALL_LIMIT_MS = 250  # A frame this late is visible
+
+
+def child(hours, result_path, use_pipeline):
+    if use_pipeline:
+        dog_log.setup('check')
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import dog_instance
+
+    dog = dog_instance.Dog(100, 100)
+    steps = int(hours * 3600 * 1000 / dog_instance.FRAME_MS)
+    worst = 0.0
+    started = time.perf_counter()
+    for step in range(steps):
+        start = time.perf_counter()
+        dog.update(dog_instance.FRAME_MS)
+        if step % 6 == 0:
+            print(f"step {step}: {dog.state} at ({dog.x}, {dog.y})")
+        worst = max(worst, (time.perf_counter() - start) * 1000)
+
+    with open(result_path, 'w') as f:
+        json.dump({'steps': steps, 'worst_ms': worst, 'seconds': time.perf_counter() - started}, f)
+    dog_instance.stop_control_bus()
+    zone_table.remove_table()  # Its own block, named after the temporary bus folder
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    hours = float(args[0]) if args else 3
+    use_pipeline = '--without-pipeline' not in sys.argv
+
+    with tempfile.TemporaryDirectory() as folder:
+        result_path = os.path.join(folder, 'result.json')
+        env = dict(os.environ, SCHNAUZER_LOG_DIR=os.path.join(folder, 'logs'), SCHNAUZER_LOG_LEVEL='DEBUG',
+                   SCHNAUZER_BUS_DIR=os.path.join(folder, 'bus'), SDL_VIDEODRIVER='dummy')
+        process = subprocess.Popen(
+            [sys.executable, __file__, '--child', str(hours), result_path, '1' if use_pipeline else '0'],
+            env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE  # Never read, on purpose
+        )
+        try:
+            process.wait(timeout=600 if use_pipeline else 30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+            print(f"FAIL: the dog stalled (no result after {hours} simulated hours)")
+            return 1
+
+        if not os.path.exists(result_path):
+            print(f"FAIL: the dog exited with {process.returncode} before finishing")
+            return 1
+        with open(result_path) as f:
+            result = json.load(f)
+
+        logs = os.path.join(folder, 'logs')
+        files = {name: os.path.getsize(os.path.join(logs, name)) for name in sorted(os.listdir(logs))}
+        total = sum(files.values())
+        cap = (dog_log.LOG_BACKUPS + 1) * dog_log.LOG_MAX_BYTES
+
+        print(f"{result['steps']} steps ({hours} simulated hours) in {result['seconds']:.1f} s")
+        print(f"Slowest step: {result['worst_ms']:.2f} ms")
+        print(f"Log files: {files} ({total} bytes, cap {cap})")
+
+        failed = False
+        if result['worst_ms'] > STALL_LIMIT_MS:
+            print(f"FAIL: a step took longer than {STALL_LIMIT_MS} ms")
+            failed = True
+        if total > cap * 1.05:
+            print("FAIL: logs grew past the rotation cap")
+            failed = True
+        if not failed:
+            print("OK")
+        return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['--child']:
+        child(float(sys.argv[2]), sys.argv[3], sys.argv[4] == '1')
+    else:
+        sys.exit(main())
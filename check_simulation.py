@@ -0,0 +1,106 @@
+"""
+Run a headless dog through hours of simulated time and check its state machine
+
+No window, no sleeping: the dog runs on a SimClock through Dog.simulate(),
+with its zones replaced every few simulated minutes. Checks that every
+animation was built with real frames (not blank placeholders), that every
+state comes up, that the dog only ever idles or walks on a floor, that
+poops expire and that a zone change never leaves it stranded, then
+reports how much faster than real time it ran. The run is traced and
+replayed (see dog_trace.py) and must come out the same; zones also change
+while the dog is mid-teleport, which re-picks its landing spot. The seed
+is printed, so a failing run can be repeated exactly.
+
+Usage: python check_simulation.py [hours] [seed]
+"""
+import io
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import dog_instance
+import dog_trace
+
+ZONE_SETS = [
+    [[50, 500, 500, 60], [600, 1000, 500, 60]],
+    [[0, 300, 300, 60], [350, 1000, 500, 60], [100, 700, 200, 60]],
+    [[200, 800, 400, 60]],
+    [[50, 500, 450, 60], [520, 1000, 500, 60]],
+]
+RELOAD_EVERY = 5 * 60 * 1000  # Simulated ms between zone changes
+POOP_LIFETIME = 5000
+ALL_STATES = {'idle', 'walk', 'backflip', 'sit', 'poop', 'portal_out', 'portal_in'}
+
+
+def main():
+    hours = float(sys.argv[1]) if len(sys.argv) > 1 else 6
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else random.randrange(2 ** 32)
+    duration = int(hours * 3600 * 1000)
+
+    trace = io.BytesIO()
+    dog = dog_instance.Dog(100, 100, headless=True, seed=seed, trace=trace)
+    states = set()
+    problems = []
+    for name, frames in dog.animations.items():
+        blank = sum(1 for frame in frames if not frame.get_bounding_rect().width)
+        if blank:
+            problems.append(f"{name} has {blank} blank frame(s) of {len(frames)}")
+    update = dog.update
+    changes = [0]
+    mid_teleport = [False]  # Change the zones at the next portal_out, once per reload
+    
+    def change_zones():
+        changes[0] += 1
+        dog.apply_settings({'zones': ZONE_SETS[changes[0] % len(ZONE_SETS)], 'revision': changes[0]})
+
+    def checked_update(dt):
+        update(dt)
+        states.add(dog.state)
+        if dog.state in ('idle', 'walk') and not dog.is_in_visible_zone():
+            problems.append(f"{dog.state} off the floor at ({dog.x}, {dog.y}), t={dog.clock.now} ms")
+        if any(poop['timer'] <= 0 or poop['timer'] > POOP_LIFETIME for poop in dog.poops):
+            problems.append(f"poop outlived its timer, t={dog.clock.now} ms")
+        if mid_teleport[0] and dog.state == 'portal_out':
+            mid_teleport[0] = False
+            change_zones()  # Before the dog lands, so its target may have to move
+
+    dog.update = checked_update
+
+    updates = 0
+    started = time.perf_counter()
+    while dog.clock.now < duration:
+        change_zones()
+        mid_teleport[0] = True
+        updates += dog.simulate(min(RELOAD_EVERY, duration - dog.clock.now), draw=True)
+    seconds = time.perf_counter() - started
+
+    print(f"Seed {seed}")
+    print(f"{hours} simulated hours in {seconds:.2f} s ({dog.clock.now / 1000 / seconds:.0f}x real time)")
+    print(f"{updates} updates ({updates / seconds:.0f} per second), {changes[0]} zone changes")
+    print(f"States seen: {', '.join(sorted(states))}")
+    
+    dog.stop_trace()
+    recorded = trace.getvalue()
+    random.seed(seed + 1)  # Replays must not depend on the global generator
+    started = time.perf_counter()
+    replayed = dog_trace.replay(recorded)
+    print(f"Replayed {len(recorded)} bytes of trace in {time.perf_counter() - started:.2f} s")
+    if replayed != recorded:
+        difference = dog_trace.first_difference(recorded, replayed)
+        problems.append(f"replay differs at record {difference[0]}: recorded {difference[1]}, replayed {difference[2]}"
+                        if difference else "replay differs")
+
+    missing = ALL_STATES - states
+    if missing:
+        problems.append(f"never got to {', '.join(sorted(missing))}")
+    for problem in problems[:10]:
+        print(f"FAIL: {problem}")
+    if not problems:
+        print("OK")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+"""
+Local control bus between the launcher and every running dog process
+
+Each dog process (or multi-dog host) listens on its own local endpoint, a
+Unix socket or a named pipe on Windows, and drops a small <pid>.json
+registration next to it in bus_dir(). Anyone who can read that folder can
+list the live dogs and push a command to all of them in one broadcast,
+whoever started them.
+
+Messages are JSON dicts with a 'command' key. 'info' is answered straight
+from the listener thread; everything else is handed to the process's main
+loop (the handler posts a pygame event) and acknowledged at once.
+Connections are authenticated with a per-user key kept in bus_dir().
+"""
+import json
+import os
+import socket
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener, answer_challenge, deliver_challenge
+
+import settings_store
+
+REPLY_TIMEOUT = 2.0  # Seconds to wait for a peer's answer
+MAX_PARALLEL = 32  # Peers contacted at once by broadcast()
+KEY_SIZE = 32
+
+
+def bus_dir():
+    """Per-user folder holding the endpoint registrations and the bus key"""
+    if os.environ.get('SCHNAUZER_BUS_DIR'):
+        return os.environ['SCHNAUZER_BUS_DIR']
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+        return os.path.join(base, 'SchnauzerPet', 'bus')
+    if os.environ.get('XDG_RUNTIME_DIR'):
+        return os.path.join(os.environ['XDG_RUNTIME_DIR'], 'schnauzer_pet')
+    return os.path.join(tempfile.gettempdir(), f'schnauzer_pet-{os.getuid()}')
+
+
+def endpoint_address(pid):
+    """(address, family) a process listens on"""
+    if os.name == 'nt':
+        return rf'\\.\pipe\schnauzer-pet-{pid}', 'AF_PIPE'
+    return os.path.join(bus_dir(), f'{pid}.sock'), 'AF_UNIX'
+
+
+def auth_key():
+    """Shared secret for this user's bus, created by whoever comes first"""
+    folder = bus_dir()
+    os.makedirs(folder, mode=0o700, exist_ok=True)
+    path = os.path.join(folder, 'key')
+    with settings_store.locked(path):
+        try:
+            with open(path, 'rb') as f:
+                key = f.read()
+            if len(key) == KEY_SIZE:
+                return key
+        except OSError:
+            pass
+        key = os.urandom(KEY_SIZE)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(key)
+        return key
+
+
+class UnixListener:
+    """Listener(address, 'AF_UNIX', authkey) on a socket we hold ourselves
+
+    Same accept() and authentication as multiprocessing's, but a forked
+    child can drop its copy of the socket without unlinking the parent's.
+    """
+
+    def __init__(self, address, authkey):
+        self.address = address
+        self.authkey = authkey
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.bind(address)
+        self.socket.listen(16)
+
+    def accept(self):
+        sock, _ = self.socket.accept()
+        conn = Connection(sock.detach())
+        try:
+            # The order Listener.accept() uses, to match Client()
+            deliver_challenge(conn, self.authkey)
+            answer_challenge(conn, self.authkey)
+        except BaseException:
+            conn.close()
+            raise
+        return conn
+
+    def close(self, unlink=True):
+        self.socket.close()
+        if unlink:
+            try:
+                os.remove(self.address)
+            except OSError:
+                pass
+
+
+class Endpoint:
+    """This process's listener; handler(message) runs on the listener thread"""
+
+    def __init__(self, kind, handler):
+        self.kind = kind
+        self.handler = handler
+        self.address, family = endpoint_address(os.getpid())
+        if family == 'AF_UNIX' and os.path.exists(self.address):
+            os.remove(self.address)  # Left by a dead process that had our pid
+        if family == 'AF_UNIX':
+            self.listener = UnixListener(self.address, auth_key())
+        else:
+            self.listener = Listener(self.address, family, authkey=auth_key())
+        self.registration = os.path.join(bus_dir(), f'{os.getpid()}.json')
+        settings_store.write_atomic(self.registration, {
+            'pid': os.getpid(), 'kind': kind, 'address': self.address, 'family': family,
+        })
+        self.connection = None  # Being answered on the listener thread
+        threading.Thread(target=self.serve, daemon=True).start()
+
+    def serve(self):
+        while True:
+            try:
+                conn = self.listener.accept()
+            except Exception as e:
+                if self.listener is None:
+                    return  # close() was called
+                # Failed authentication and the like, not fatal for the bus
+                print(f"Control bus: rejected a connection ({e})")
+                continue
+            self.connection = conn  # For abandon(), if the handler forks
+            try:
+                with conn:
+                    if not conn.poll(REPLY_TIMEOUT):
+                        continue
+                    message = json.loads(conn.recv_bytes())
+                    reply = self.handler(message) if isinstance(message, dict) else None
+                    conn.send_bytes(json.dumps(reply if reply is not None else {'ok': True}).encode())
+            except (OSError, EOFError, ValueError) as e:
+                print(f"Control bus: dropped a message ({e})")
+            finally:
+                self.connection = None
+
+    def close(self):
+        listener, self.listener = self.listener, None
+        try:
+            os.remove(self.registration)
+        except OSError:
+            pass
+        if listener is not None:
+            listener.close()  # Also removes the Unix socket file
+
+    def abandon(self):
+        """In a forked child: drop the parent's listener, leaving its socket and registration
+
+        Also closes our copy of the connection the parent was answering when
+        it forked (the zygote's spawn request); the parent still replies on it.
+        """
+        listener, self.listener = self.listener, None
+        if isinstance(listener, UnixListener):
+            listener.close(unlink=False)  # Only our copy of the fd, the file is the parent's
+        connection, self.connection = self.connection, None
+        if connection is not None:
+            connection.close()
+
+
+def registrations():
+    """Registration dicts of every process that announced itself (some may be dead)"""
+    folder = bus_dir()
+    try:
+        names = os.listdir(folder)
+    except OSError:
+        return []
+    found = []
+    for name in names:
+        if name.endswith('.json'):
+            data = settings_store.read_settings(os.path.join(folder, name))
+            if data and 'address' in data:
+                found.append(data)
+    return found
+
+
+def connect(peer, key):
+    """Authenticated connection to a peer, or None if it takes over REPLY_TIMEOUT
+
+    Client() connects and runs the auth handshake with blocking reads, so
+    a stopped or hung peer would hang the caller (a dog's main loop, the
+    launcher's Tk thread). It runs on a throwaway thread instead; a
+    connection that turns up too late is closed when that thread ends.
+    """
+    result = []
+
+    def handshake():
+        try:
+            result.append(Client(peer['address'], peer['family'], authkey=key))
+        except (OSError, EOFError, ValueError, AuthenticationError) as e:
+            result.append(e)
+
+    thread = threading.Thread(target=handshake, daemon=True)
+    thread.start()
+    thread.join(REPLY_TIMEOUT)
+    if not result:
+        print(f"Control bus: process {peer.get('pid')} did not answer")
+        return None
+    if isinstance(result[0], Exception):
+        raise result[0]
+    return result[0]
+
+
+def send(peer, message, key=None):
+    """Send one message to a registered peer; returns its reply, or None if it is gone"""
+    try:
+        conn = connect(peer, key or auth_key())
+        if conn is None:
+            return None
+        with conn:
+            conn.send_bytes(json.dumps(message).encode())
+            if not conn.poll(REPLY_TIMEOUT):
+                return None
+            return json.loads(conn.recv_bytes())
+    except (OSError, EOFError, ValueError, AuthenticationError):
+        if not pid_alive(peer.get('pid')):
+            forget(peer)
+        return None
+
+
+def broadcast(message):
+    """Send message to every live process on the bus; returns {pid: reply}
+
+    Peers are contacted in parallel, so hung ones cost one timeout in
+    total (2 x REPLY_TIMEOUT at most) rather than one each.
+    """
+    key = auth_key()
+    peers = registrations()
+    if not peers:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(len(peers), MAX_PARALLEL)) as pool:
+        replies = list(pool.map(lambda peer: send(peer, message, key), peers))
+    return {peer['pid']: reply for peer, reply in zip(peers, replies) if reply is not None}
+
+
+def send_to(kind, message):
+    """Send message to the first live process of a kind ('zygote', ...); its reply, or None"""
+    key = auth_key()
+    for peer in registrations():
+        if peer.get('kind') == kind:
+            reply = send(peer, message, key)
+            if reply is not None:
+                return reply
+    return None
+
+
+def list_dogs():
+    """Every live dog as (pid, info dict), whichever process runs it"""
+    dogs = []
+    for pid, reply in sorted(broadcast({'command': 'info'}).items()):
+        for info in reply.get('dogs', []):
+            dogs.append((pid, info))
+    return dogs
+
+
+def pid_alive(pid):
+    if not pid:
+        return False
+    if os.name == 'nt':
+        import ctypes
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        handle = ctypes.windll.kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass  # Exists, but belongs to someone else
+    return True
+
+
+def forget(peer):
+    """Remove what a crashed process left behind"""
+    paths = [os.path.join(bus_dir(), f"{peer.get('pid')}.json")]
+    if peer.get('family') == 'AF_UNIX':
+        paths.append(peer['address'])
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
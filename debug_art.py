@@ -2,32 +2,35 @@ import schnauzer_art
 import pygame
 
 def inspect():
+    frames = schnauzer_art.frame_names()
     print(f"GRID_SIZE: {schnauzer_art.GRID_SIZE}")
-    print(f"Total Frames: {len(schnauzer_art.FRAMES)}")
-    
-    if not schnauzer_art.FRAMES:
+    print(f"Total Frames: {len(frames)}")
+
+    if not frames:
         print("ERROR: No frames found!")
         return
 
     # Inspect first frame
-    first_key = list(schnauzer_art.FRAMES.keys())[0]
-    pixels = schnauzer_art.FRAMES[first_key]
-    
+    first_key = frames[0]
+    anim_name, frame_idx = first_key.rsplit('_', 1)
+    frame = schnauzer_art.get_frame(anim_name, int(frame_idx))
+    rgba = schnauzer_art.load_pixels()[first_key]
+    opaque = [i // 4 for i in range(3, len(rgba), 4) if rgba[i]]
+
     print(f"\nFrame '{first_key}':")
-    print(f"  Pixel Count: {len(pixels)}")
-    
-    if not pixels:
+    print(f"  Pixel Count: {len(opaque)}")
+
+    if not opaque:
         print("  ERROR: Frame has no pixels!")
         return
-        
+
     # Bounding box
-    xs = [p[0] for p in pixels]
-    ys = [p[1] for p in pixels]
-    print(f"  X Range: {min(xs)} - {max(xs)}")
-    print(f"  Y Range: {min(ys)} - {max(ys)}")
-    
+    bounds = frame.get_bounding_rect()
+    print(f"  X Range: {bounds.left} - {bounds.right - 1}")
+    print(f"  Y Range: {bounds.top} - {bounds.bottom - 1}")
+
     # Check colors
-    colors = set([p[2] for p in pixels])
+    colors = set(tuple(rgba[i * 4:i * 4 + 3]) for i in opaque)
     print(f"  Unique Colors: {len(colors)}")
     print(f"  Sample Colors: {list(colors)[:5]}")
 
@@ -1,13 +1,31 @@
 """
 Single dog instance - spawned as separate process
 """
-import pygame
+import time
+START_TIME = time.perf_counter()  # For the time-to-first-frame report
+
 import sys
+if __name__ == "__main__" and not (sys.stdout and sys.stdout.isatty()):
+    # Started by the launcher or another dog: output goes to a rotating log
+    # file instead of a pipe nobody may be reading (see dog_log.py)
+    import dog_log
+    dog_log.setup(sys.argv[1][2:] if sys.argv[1:2] in (['--host'], ['--zygote']) else 'dog')
+
+import pygame
 import os
 import random
 import math
 import json
+import hashlib
+import logging
 import subprocess
+import threading
+from bisect import bisect_left, bisect_right
+
+import control_bus
+import dog_trace
+import settings_store
+import zone_table
 
 # Initialize pygame
 pygame.init()
@@ -34,6 +52,195 @@ SETTINGS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "schnau
 DOG_INSTANCE_SCRIPT = os.path.abspath(__file__)
 PYTHON_EXE = sys.executable
 
+log = logging.getLogger('schnauzer.dog')
+
+# Messages from the launcher or other dogs over the control bus (see control_bus.py)
+BUS_COMMAND = pygame.event.custom_type()
+
+# Posted by the settings file watcher (Linux), dogs elsewhere poll every ZONE_CHECK_INTERVAL
+SETTINGS_CHANGED = pygame.event.custom_type()
+
+# Main loops sleep until the next deadline instead of ticking at a fixed rate
+FPS = 60
+FRAME_MS = 1000 // FPS
+PAUSED_WAIT = 60 * 1000  # A paused dog only wakes for input
+ZONE_CHECK_INTERVAL = 2000
+BUS_ZONE_CHECK_INTERVAL = 10 * 1000  # Dogs on the bus still poll, for writes nobody broadcast
+BACKFLIP_TIME = 600
+
+# The only events that can wake a sleeping dog (no mouse-motion floods)
+DOG_EVENTS = [
+    pygame.QUIT, pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN,
+    pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, BUS_COMMAND, SETTINGS_CHANGED,
+]
+
+
+def cache_dir():
+    """Per-user directory for frames baked by earlier runs"""
+    if os.environ.get('SCHNAUZER_CACHE_DIR'):
+        return os.environ['SCHNAUZER_CACHE_DIR']
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+        return os.path.join(base, 'SchnauzerPet', 'cache')
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'schnauzer_pet')
+
+
+_first_frame_shown = False
+
+def report_first_frame():
+    """Print how long this process took to put its first frame on screen"""
+    global _first_frame_shown
+    if not _first_frame_shown:
+        _first_frame_shown = True
+        print(f"First frame after {(time.perf_counter() - START_TIME) * 1000:.0f} ms")
+
+
+_settings_watched = None
+
+def watch_settings():
+    """Post SETTINGS_CHANGED whenever the settings file changes (started once per process)
+
+    Returns False where there are no change notifications and dogs have to poll.
+    """
+    global _settings_watched
+    if _settings_watched is None:
+        def post_change():
+            try:
+                pygame.event.post(pygame.event.Event(SETTINGS_CHANGED))
+            except pygame.error:
+                pass  # Display is being swapped for the zone editor; nothing to wake
+        _settings_watched = settings_store.watch(SETTINGS_FILE, post_change)
+    return _settings_watched
+
+
+_bus = None
+
+def start_control_bus(kind, describe):
+    """Join the control bus, once per process; messages arrive as BUS_COMMAND events
+
+    describe() answers 'info' requests from the listener thread. Returns
+    False if the bus could not be started.
+    """
+    global _bus
+    if _bus is None:
+        def handle(message):
+            if message.get('command') == 'info':
+                return describe()
+            try:
+                pygame.event.post(pygame.event.Event(BUS_COMMAND, message=message))
+            except pygame.error:
+                return {'ok': False}  # Display is being swapped for the zone editor
+        try:
+            _bus = control_bus.Endpoint(kind, handle)
+        except Exception as e:
+            print(f"Control bus unavailable: {e}")
+            _bus = False
+    return bool(_bus)
+
+
+def stop_control_bus():
+    global _bus
+    if _bus:
+        _bus.close()
+    _bus = None
+
+
+_zone_table = None
+
+def shared_zones():
+    """The zone table shared by every dog process, or None without shared memory"""
+    global _zone_table
+    if _zone_table is None:
+        table = zone_table.open_table()
+        if table is not None:
+            table.fallback = lambda: normalize_zones(load_settings().get('zones', []))
+        _zone_table = table if table is not None else False
+    return _zone_table if _zone_table is not False else None
+
+
+def normalize_zones(zones):
+    """Zones as [x1, x2, y, height]; very old settings only stored x1, x2"""
+    normalized = []
+    for z in zones:
+        if len(z) >= 4:
+            normalized.append(list(z))
+        else:
+            normalized.append([z[0], z[1], GROUND_Y, 60])
+    return normalized
+
+
+def publish_settings(settings):
+    """Push freshly saved settings to every process on the bus, this one included
+
+    Zones already went into the shared table, so they are left out and
+    dogs reading the table don't parse them again.
+    """
+    if settings and _bus:
+        if shared_zones() is not None:
+            settings = {key: value for key, value in settings.items() if key != 'zones'}
+        # Nobody waits for the replies; a hung peer must not stall this dog's animation
+        threading.Thread(target=control_bus.broadcast, args=({'command': 'settings', 'settings': settings},),
+                         daemon=True).start()
+
+
+def restrict_events():
+    """Only queue the events the dog main loops react to"""
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(DOG_EVENTS)
+
+
+def wait_for_events(timeout):
+    """Sleep up to timeout ms or until input arrives, return the pending events"""
+    if timeout <= FRAME_MS:
+        return pygame.event.get()
+    event = pygame.event.wait(int(timeout))
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
+
+
+class LoopStats:
+    """Main loop counters, reported with 'info' over the control bus (see bench_scaling.py)"""
+    
+    def __init__(self):
+        self.loops = 0
+        self.busy_ms = 0.0  # Handling events, updating and drawing, not sleeping
+        self.frames = 0  # Loops that had to come round every frame (something moving)
+        self.frame_ms = 0  # Time those took from one to the next, ideally FRAME_MS each
+    
+    def record(self, wait, dt, busy_ms):
+        self.loops += 1
+        self.busy_ms += busy_ms
+        if wait <= FRAME_MS:
+            self.frames += 1
+            self.frame_ms += dt
+    
+    def snapshot(self):
+        return dict(vars(self))
+
+
+class SimClock:
+    """Stand-in for pygame.time.Clock that never sleeps, for headless dogs
+
+    Simulated time only moves when the loop waits (what wait_for_events()
+    would have slept) or when a tick has to hold the frame rate, so a
+    simulation runs as fast as update() allows.
+    """
+    
+    def __init__(self):
+        self.now = 0  # Simulated ms since start
+        self.last_tick = 0
+    
+    def wait(self, ms):
+        self.now += max(0, int(ms))
+    
+    def tick(self, framerate=0):
+        if framerate:
+            self.now = max(self.now, self.last_tick + 1000 // framerate)
+        dt, self.last_tick = self.now - self.last_tick, self.now
+        return dt
+
 
 class SchauzerSprites:
     """Generate pixel art schnauzer sprites"""
@@ -41,13 +248,121 @@ class SchauzerSprites:
     _frame_cache = {}
     ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
 
+    _raw_cache = {}
+    BACKFLIP_STEPS = 12  # Rotation steps per backflip, see 'backflip_steps' setting
+
+    # Every baked frame packed into one image by build_atlas.py
+    ATLAS_IMAGE = os.path.join(ASSETS_DIR, "atlas.png")
+    ATLAS_MANIFEST = os.path.join(ASSETS_DIR, "atlas.json")
+    USE_ATLAS = True  # build_atlas.py turns this off to bake from the source PNGs
+    _atlas = None
+
+    # Asset files the runtime frames are baked from
+    PROCESSED_FRAMES = [
+        'idle',
+        'walk_1', 'walk_2', 'walk_3', 'walk_4', 'walk_5', 'walk_6', 'walk_7',
+        'sit_1', 'sit_2',
+        'poop_1', 'poop_2', 'poop_3', 'poop_4',
+    ]
+    SOURCE_FILES = (
+        [f"processed_{name}.png" for name in PROCESSED_FRAMES]
+        + [f"portal out {i}.png" for i in range(1, 14)]
+        + [f"portal_in_{i}.png" for i in range(1, 4)]
+    )
+    PORTAL_SIZE = 160
+
+    # Every baked frame from an earlier run, stored in cache_dir() as raw
+    # pixels. Bump BAKE_VERSION when the way frames are built changes
+    BAKE_VERSION = 2  # 2: caches from before placeholders were kept out
+    _baked = {}
+    _bake_path = None  # Where to save the frames once built, None on a warm start
+    _bake_checked = False
+    _source_hashes = None
+    _placeholders = False  # A frame failed to build and was replaced by a blank one
+
+    @staticmethod
+    def source_hashes():
+        """name -> SHA-1 of every source asset (None if missing), read once"""
+        if SchauzerSprites._source_hashes is None:
+            hashes = {}
+            for name in SchauzerSprites.SOURCE_FILES:
+                try:
+                    with open(os.path.join(SchauzerSprites.ASSETS_DIR, name), 'rb') as f:
+                        hashes[name] = hashlib.sha1(f.read()).hexdigest()
+                except OSError:
+                    hashes[name] = None
+            SchauzerSprites._source_hashes = hashes
+        return SchauzerSprites._source_hashes
+
+    @staticmethod
+    def get_atlas_frames():
+        """name -> frame from the atlas, decoded once; empty if missing or stale"""
+        if SchauzerSprites._atlas is None:
+            frames = {}
+            if SchauzerSprites.USE_ATLAS:
+                try:
+                    with open(SchauzerSprites.ATLAS_MANIFEST, 'r') as f:
+                        manifest = json.load(f)
+                    
+                    # Content, not mtimes: a fresh checkout writes files in any order
+                    recorded = manifest['sources'] if isinstance(manifest['sources'], dict) else {}
+                    hashes = SchauzerSprites.source_hashes()
+                    stale = [name for name in SchauzerSprites.SOURCE_FILES if recorded.get(name) != hashes[name]]
+                    
+                    if stale:
+                        print(f"Sprite atlas was packed from a different {stale[0]}, run build_atlas.py")
+                    elif manifest['frame_size'] == [PET_WIDTH, PET_HEIGHT]:
+                        sheet = pygame.image.load(SchauzerSprites.ATLAS_IMAGE)
+                        for name, entry in manifest['frames'].items():
+                            frame = sheet.subsurface(pygame.Rect(entry['rect']))
+                            anchor = tuple(entry.get('anchor', (0, 0)))
+                            if anchor != (0, 0) or frame.get_size() != (PET_WIDTH, PET_HEIGHT):
+                                # Trimmed cell: place it in a window-sized frame (MAX = exact copy)
+                                padded = pygame.Surface((PET_WIDTH, PET_HEIGHT), pygame.SRCALPHA)
+                                padded.fill((0, 0, 0, 0))
+                                padded.blit(frame, anchor, special_flags=pygame.BLEND_RGBA_MAX)
+                                frame = padded
+                            frames[name] = frame
+                except FileNotFoundError:
+                    pass
+                except (OSError, ValueError, KeyError, pygame.error) as e:
+                    print(f"Ignoring sprite atlas: {e}")
+                    frames = {}
+            SchauzerSprites._atlas = frames
+        return SchauzerSprites._atlas
+
+    @staticmethod
+    def get_packed_frames():
+        """name -> frame from the baked-frame cache if loaded, otherwise the atlas"""
+        return SchauzerSprites._baked or SchauzerSprites.get_atlas_frames()
+
+    @staticmethod
+    def get_packed_sequence(prefix, start=1):
+        """Packed frames <prefix>_<start>, <prefix>_<start+1>, ... in order"""
+        packed = SchauzerSprites.get_packed_frames()
+        frames = []
+        while f"{prefix}_{start + len(frames)}" in packed:
+            frames.append(packed[f"{prefix}_{start + len(frames)}"])
+        return frames
+
+    @staticmethod
+    def get_raw_frame(name):
+        """Processed frame exactly as stored on disk (unpadded), decoded once"""
+        if name not in SchauzerSprites._raw_cache:
+            path = os.path.join(SchauzerSprites.ASSETS_DIR, f"processed_{name}.png")
+            SchauzerSprites._raw_cache[name] = pygame.image.load(path)
+        return SchauzerSprites._raw_cache[name]
+
     @staticmethod
     def get_disk_frame(name):
         """Load processed frame from disk"""
         if name not in SchauzerSprites._frame_cache:
-            path = os.path.join(SchauzerSprites.ASSETS_DIR, f"processed_{name}.png")
+            packed = SchauzerSprites.get_packed_frames()
+            if name in packed:
+                SchauzerSprites._frame_cache[name] = packed[name]
+                return packed[name]
             try:
-                img = pygame.image.load(path)
+                img = SchauzerSprites.get_raw_frame(name)
                 
                 # Check if we need to pad (if image is smaller than window)
                 if img.get_width() != PET_WIDTH or img.get_height() != PET_HEIGHT:
@@ -63,11 +378,70 @@ class SchauzerSprites:
                     SchauzerSprites._frame_cache[name] = img
             except Exception as e:
                 print(f"Error loading {name}: {e}")
+                SchauzerSprites._placeholders = True
                 s = pygame.Surface((PET_WIDTH, PET_HEIGHT), pygame.SRCALPHA)
                 s.fill((0,0,0,0)) # Revert error color to transparent
                 SchauzerSprites._frame_cache[name] = s
         return SchauzerSprites._frame_cache[name]
 
+    @staticmethod
+    def baked_cache_path(backflip_steps):
+        """Cache file for the current source assets and bake parameters"""
+        digest = hashlib.sha1(
+            f"{SchauzerSprites.BAKE_VERSION}|{PET_WIDTH}x{PET_HEIGHT}|"
+            f"{SchauzerSprites.PORTAL_SIZE}|{backflip_steps}".encode())
+        for name, source_hash in SchauzerSprites.source_hashes().items():
+            digest.update(f"{name}={source_hash or 'missing'}".encode())
+        return os.path.join(cache_dir(), f"frames_{digest.hexdigest()[:16]}.bin")
+
+    @staticmethod
+    def load_baked_frames(path):
+        """name -> frame saved by save_baked_frames, or {} if there's no usable file
+
+        One read; the frames are views into that buffer, nothing is decoded.
+        """
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            header_end = data.index(b'\n')
+            names = json.loads(data[:header_end])
+        except (OSError, ValueError):
+            return {}
+        
+        frame_bytes = PET_WIDTH * PET_HEIGHT * 4
+        pixels = memoryview(data)[header_end + 1:]
+        if len(pixels) != frame_bytes * len(names):
+            return {}
+        return {
+            name: pygame.image.frombuffer(pixels[i * frame_bytes:(i + 1) * frame_bytes], (PET_WIDTH, PET_HEIGHT), 'RGBA')
+            for i, name in enumerate(names)
+        }
+
+    @staticmethod
+    def save_baked_frames(path, frames):
+        """Store (name, frame) pairs as a JSON name list plus raw RGBA
+
+        Cache files for older sources or settings are removed.
+        """
+        try:
+            folder = os.path.dirname(path)
+            os.makedirs(folder, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(json.dumps([name for name, frame in frames]).encode() + b'\n')
+                for name, frame in frames:
+                    f.write(pygame.image.tostring(frame, 'RGBA'))
+            os.replace(tmp_path, path)  # Atomic, other dogs never see half a file
+            
+            # Older caches, including the backflip-only .rgba strips
+            for old in os.listdir(folder):
+                if old == os.path.basename(path):
+                    continue
+                if (old.startswith('frames_') and old.endswith('.bin')) or old.endswith('.rgba'):
+                    os.remove(os.path.join(folder, old))
+        except OSError as e:
+            print(f"Could not cache frames in {path}: {e}")
+
     @staticmethod
     def create_idle_frames():
         return [SchauzerSprites.get_disk_frame('idle')]
@@ -92,26 +466,30 @@ class SchauzerSprites:
         return [f1] + [f2] * 18 + [f1]
 
     @staticmethod
-    def create_backflip_frames():
+    def create_backflip_frames(num_frames=BACKFLIP_STEPS):
+        """Rotating, hopping idle frames; built once per step count and shared"""
+        key = f"backflip_{num_frames}"
+        if key in SchauzerSprites._frame_cache:
+            return SchauzerSprites._frame_cache[key]
+        
+        frames = SchauzerSprites.get_packed_sequence(key, 0)
+        if len(frames) == num_frames:
+            SchauzerSprites._frame_cache[key] = frames
+            return frames
+        
         frames = []
-        base = SchauzerSprites.get_disk_frame('idle')
-        num_frames = 12
         
         # Original sprite size assumption for centering
         SPRITE_SIZE = 120
         
+        # Rotate the unpadded 120x120 frame to avoid huge rects
+        raw_img = SchauzerSprites.get_raw_frame('idle')
+        
         for i in range(num_frames):
             surf = pygame.Surface((PET_WIDTH, PET_HEIGHT), pygame.SRCALPHA)
             surf.fill(TRANSPARENT)
             
             angle = (i / num_frames) * 360
-            
-            # Use original 120x120 frame for rotation to avoid huge rects
-            # We need to grab just the dog part from the padded frame or reload 'idle' raw
-            # Better: just load raw idle for rotation source
-            path = os.path.join(SchauzerSprites.ASSETS_DIR, "processed_idle.png")
-            raw_img = pygame.image.load(path)
-            
             rotated = pygame.transform.rotate(raw_img, angle)
             
             # Calculate jump arc
@@ -130,6 +508,7 @@ class SchauzerSprites:
             surf.blit(rotated, rect)
             frames.append(surf)
         
+        SchauzerSprites._frame_cache[key] = frames
         return frames
     
     @staticmethod
@@ -146,6 +525,10 @@ class SchauzerSprites:
     @staticmethod
     def create_portal_out_frames():
         """Portal out animation"""
+        packed = SchauzerSprites.get_packed_sequence('portal_out')
+        if packed:
+            return packed
+        
         dog_idle = SchauzerSprites.get_disk_frame('idle')
         dog_width = dog_idle.get_width()
         dog_height = dog_idle.get_height()
@@ -154,9 +537,9 @@ class SchauzerSprites:
         for i in range(1, 14):
             path = os.path.join(SchauzerSprites.ASSETS_DIR, f"portal out {i}.png")
             try:
-                portal_img = pygame.image.load(path).convert_alpha()
-                scaled_width = 160
-                scaled_height = 160
+                portal_img = pygame.image.load(path)  # No display needed; convert_for_display converts later
+                scaled_width = SchauzerSprites.PORTAL_SIZE
+                scaled_height = SchauzerSprites.PORTAL_SIZE
                 scaled_portal = pygame.transform.scale(portal_img, (scaled_width, scaled_height))
                 
                 composite = pygame.Surface((PET_WIDTH, PET_HEIGHT), pygame.SRCALPHA)
@@ -176,12 +559,17 @@ class SchauzerSprites:
                 frame_images.append(composite)
             except Exception as e:
                 print(f"Error loading portal out {i}: {e}")
+                SchauzerSprites._placeholders = True
         
         return frame_images if frame_images else [pygame.Surface((PET_WIDTH, PET_HEIGHT), pygame.SRCALPHA)]
     
     @staticmethod
     def create_portal_in_frames():
         """Portal in animation"""
+        packed = SchauzerSprites.get_packed_sequence('portal_in')
+        if packed:
+            return packed
+        
         dog_idle = SchauzerSprites.get_disk_frame('idle')
         dog_width = dog_idle.get_width()
         dog_height = dog_idle.get_height()
@@ -190,9 +578,9 @@ class SchauzerSprites:
         for i in range(1, 4):
             path = os.path.join(SchauzerSprites.ASSETS_DIR, f"portal_in_{i}.png")
             try:
-                portal_img = pygame.image.load(path).convert_alpha()
-                scaled_width = 160
-                scaled_height = 160
+                portal_img = pygame.image.load(path)  # No display needed; convert_for_display converts later
+                scaled_width = SchauzerSprites.PORTAL_SIZE
+                scaled_height = SchauzerSprites.PORTAL_SIZE
                 scaled_portal = pygame.transform.scale(portal_img, (scaled_width, scaled_height))
                 
                 composite = pygame.Surface((PET_WIDTH, PET_HEIGHT), pygame.SRCALPHA)
@@ -207,44 +595,496 @@ class SchauzerSprites:
                 frames.append(composite)
             except Exception as e:
                 print(f"Error loading portal_in_{i}: {e}")
+                SchauzerSprites._placeholders = True
         return frames if frames else [pygame.Surface((PET_WIDTH, PET_HEIGHT), pygame.SRCALPHA)]
 
+    # States drawn facing the walking direction; the rest look the same either way
+    MIRRORED_STATES = ('idle', 'walk', 'sit', 'poop')
+    
+    # Background loading order, roughly how soon the AI needs each animation
+    LOAD_ORDER = ['idle', 'walk', 'sit', 'backflip', 'poop', 'portal_out', 'portal_in']
+    
+    # Filled in one animation at a time; an absent name means "not loaded yet"
+    _animation_cache = {}
+    _mirrored_cache = {}
+    _flipped = {}  # Repeated frames (sit_2 x18, poop_2 x16) are flipped once
+    _display_format = False  # Loaded frames match the current display, see convert_for_display
+    _format_template = None  # Surface to match instead of the display (headless dogs)
+    _backflip_steps = BACKFLIP_STEPS
+    _build_lock = threading.Lock()
+    _queue_lock = threading.Lock()
+    _pending = []
+    _loader_thread = None
+
+    @staticmethod
+    def load_animation(name):
+        """Build one animation and its left-facing bank unless already loaded"""
+        with SchauzerSprites._build_lock:
+            if name not in SchauzerSprites._animation_cache:
+                if name == 'backflip':
+                    frames = SchauzerSprites.create_backflip_frames(SchauzerSprites._backflip_steps)
+                else:
+                    frames = getattr(SchauzerSprites, f"create_{name}_frames")()
+                
+                if name in SchauzerSprites.MIRRORED_STATES:
+                    mirrored = []
+                    for frame in frames:
+                        if id(frame) not in SchauzerSprites._flipped:
+                            SchauzerSprites._flipped[id(frame)] = pygame.transform.flip(frame, True, False)
+                        mirrored.append(SchauzerSprites._flipped[id(frame)])
+                else:
+                    mirrored = frames
+                
+                if SchauzerSprites._display_format:
+                    converted = {}
+                    frames = SchauzerSprites.to_display_format(frames, converted)
+                    mirrored = SchauzerSprites.to_display_format(mirrored, converted)
+                    SchauzerSprites.replace_building_blocks(converted)
+                
+                # Mirrored bank first: a name in _animation_cache means both are ready
+                SchauzerSprites._mirrored_cache[name] = mirrored
+                SchauzerSprites._animation_cache[name] = frames
+        return SchauzerSprites._animation_cache[name]
+
+    @staticmethod
+    def to_display_format(frames, converted):
+        """Copies of frames in the display's pixel format, so blits skip a per-pixel conversion
+
+        converted maps id(frame) -> copy, keeping repeated frames shared.
+        """
+        template = SchauzerSprites._format_template
+        result = []
+        for frame in frames:
+            if id(frame) not in converted:
+                try:
+                    if template is not None:
+                        converted[id(frame)] = frame.convert(template)
+                    else:
+                        converted[id(frame)] = frame.convert_alpha()
+                except pygame.error:
+                    # Display went away (zone editor swap), convert_for_display redoes it
+                    converted[id(frame)] = frame
+            result.append(converted[id(frame)])
+        return result
+
+    @staticmethod
+    def convert_for_display(template=None):
+        """Convert every loaded frame to the current display format; call after set_mode
+
+        Recreating the display (the zone editor does) can change the format,
+        so this runs again for each new window. Frames loaded later are
+        converted as they are built. Without a display, pass a surface whose
+        format to use instead.
+        """
+        with SchauzerSprites._build_lock:
+            SchauzerSprites._format_template = template
+            converted = {}
+            for cache in (SchauzerSprites._animation_cache, SchauzerSprites._mirrored_cache):
+                for name, frames in cache.items():
+                    cache[name] = SchauzerSprites.to_display_format(frames, converted)
+            
+            SchauzerSprites.replace_building_blocks(converted)
+            SchauzerSprites._flipped = {}  # Keyed by the old frames' ids
+            SchauzerSprites._display_format = True
+
+    @staticmethod
+    def replace_building_blocks(converted):
+        """Point _frame_cache at the converted copies so the originals can be freed"""
+        cache = SchauzerSprites._frame_cache
+        for name, value in cache.items():
+            if isinstance(value, list):
+                cache[name] = [converted.get(id(frame), frame) for frame in value]
+            else:
+                cache[name] = converted.get(id(value), value)
+
+    @staticmethod
+    def display_closing():
+        """Call before pygame.display.quit(); frames get reconverted for the next window"""
+        SchauzerSprites._display_format = False
+
+    @staticmethod
+    def prefetch(*names):
+        """Load animations on the background thread, these names first"""
+        with SchauzerSprites._queue_lock:
+            for name in reversed(names):
+                if name in SchauzerSprites._animation_cache:
+                    continue
+                if name in SchauzerSprites._pending:
+                    SchauzerSprites._pending.remove(name)
+                SchauzerSprites._pending.insert(0, name)
+            
+            thread = SchauzerSprites._loader_thread
+            if SchauzerSprites._pending and (thread is None or not thread.is_alive()):
+                thread = threading.Thread(target=SchauzerSprites._load_pending, daemon=True)
+                SchauzerSprites._loader_thread = thread
+                thread.start()
+
+    @staticmethod
+    def _load_pending():
+        while True:
+            with SchauzerSprites._queue_lock:
+                if not SchauzerSprites._pending:
+                    return
+                name = SchauzerSprites._pending.pop(0)
+            try:
+                SchauzerSprites.load_animation(name)
+            except Exception as e:
+                print(f"Error loading animation {name}: {e}")
+            SchauzerSprites.finish_loading()
+
+    @staticmethod
+    def load_animations(backflip_steps=BACKFLIP_STEPS, background=False):
+        """Shared name -> frames dict used by every dog in this process
+
+        With background=True only idle is built before returning; the rest
+        appear in the dict as the loader thread finishes them.
+        """
+        SchauzerSprites._backflip_steps = backflip_steps
+        if not SchauzerSprites._bake_checked:
+            # Warm start: every frame an earlier run baked from these sources
+            SchauzerSprites._bake_checked = True
+            path = SchauzerSprites.baked_cache_path(backflip_steps)
+            SchauzerSprites._baked = SchauzerSprites.load_baked_frames(path)
+            if not SchauzerSprites._baked:
+                SchauzerSprites._bake_path = path
+        
+        SchauzerSprites.load_animation('idle')
+        if background:
+            SchauzerSprites.prefetch(*SchauzerSprites.LOAD_ORDER)
+        else:
+            for name in SchauzerSprites.LOAD_ORDER:
+                SchauzerSprites.load_animation(name)
+            SchauzerSprites.finish_loading()
+        return SchauzerSprites._animation_cache
+
+    @staticmethod
+    def baked_frames():
+        """(name, frame) for every distinct frame the animations use"""
+        frames = [(name, SchauzerSprites.get_disk_frame(name)) for name in SchauzerSprites.PROCESSED_FRAMES]
+        for prefix in ('portal_out', 'portal_in'):
+            for i, frame in enumerate(SchauzerSprites.load_animation(prefix), 1):
+                frames.append((f"{prefix}_{i}", frame))
+        
+        steps = SchauzerSprites._backflip_steps
+        for i, frame in enumerate(SchauzerSprites.load_animation('backflip')):
+            frames.append((f"backflip_{steps}_{i}", frame))
+        return frames
+
+    @staticmethod
+    def finish_loading():
+        """Once every animation is built: save the baked frames after a cold start
+        and drop the packed frames (baked buffer, atlas) that are no longer needed"""
+        if not all(name in SchauzerSprites._animation_cache for name in SchauzerSprites.LOAD_ORDER):
+            return
+        
+        path = SchauzerSprites._bake_path
+        if path:
+            SchauzerSprites._bake_path = None
+            if SchauzerSprites._placeholders:
+                # Keyed by the sources, a blank frame would stick until an asset changes
+                print("Some frames failed to build, not caching them")
+            else:
+                SchauzerSprites.save_baked_frames(path, SchauzerSprites.baked_frames())
+        SchauzerSprites._baked = {}
+        SchauzerSprites._atlas = {}
+
+    @staticmethod
+    def load_mirrored_animations():
+        """Left-facing bank, filled in alongside load_animations"""
+        return SchauzerSprites._mirrored_cache
+
 
-def load_settings():
-    """Load settings from file"""
+def load_settings(reader=None):
+    """Load settings from file (through reader, if given, so it knows the revision)"""
     default = {
         'zones': [[50, 500, GROUND_Y, 60], [SCREEN_WIDTH - 500, SCREEN_WIDTH - 50, GROUND_Y, 60]],
         'stay_on_top': True
     }
-    try:
-        if os.path.exists(SETTINGS_FILE):
-            with open(SETTINGS_FILE, 'r') as f:
-                data = json.load(f)
-                if 'zones' in data and len(data['zones']) > 0:
-                    if 'stay_on_top' not in data:
-                        data['stay_on_top'] = True
-                    return data
-    except:
-        pass
+    data = reader.read() if reader else settings_store.read_settings(SETTINGS_FILE)
+    if data and data.get('zones'):
+        if 'stay_on_top' not in data:
+            data['stay_on_top'] = True
+        return data
     return default
 
 
-def save_settings(settings):
-    """Save settings to file"""
+def save_settings(changes):
+    """Merge changes into the settings file; returns what was written, or None on failure"""
     try:
-        with open(SETTINGS_FILE, 'w') as f:
-            json.dump(settings, f)
-    except:
-        pass
+        return settings_store.update_settings(SETTINGS_FILE, changes)
+    except Exception as e:
+        print(f"Could not save settings: {e}")
+        return None
+
+
+def apply_window_styles(stay_on_top):
+    """Make the current window a colour-keyed, borderless tool window (Windows only)
+
+    Returns the window handle. Raises on platforms without ctypes.windll.
+    """
+    import ctypes
+    hwnd = pygame.display.get_wm_info()['window']
+
+    GWL_EXSTYLE = -20
+    WS_EX_LAYERED = 0x00080000
+    WS_EX_TOOLWINDOW = 0x00000080
+    LWA_COLORKEY = 0x00000001
+
+    style = ctypes.windll.user32.GetWindowLongW(hwnd, GWL_EXSTYLE)
+    style = style | WS_EX_LAYERED | WS_EX_TOOLWINDOW
+    ctypes.windll.user32.SetWindowLongW(hwnd, GWL_EXSTYLE, style)
+
+    ctypes.windll.user32.SetLayeredWindowAttributes(
+        hwnd,
+        0x00FF00FF,
+        0,
+        LWA_COLORKEY
+    )
+
+    set_window_topmost(hwnd, stay_on_top)
+    return hwnd
+
+
+def set_window_topmost(hwnd, stay_on_top):
+    """Put a window in or out of the always-on-top band (Windows only)"""
+    import ctypes
+    HWND_TOPMOST = -1
+    HWND_NOTOPMOST = -2
+    SWP_NOMOVE = 0x0002
+    SWP_NOSIZE = 0x0001
+    SWP_NOACTIVATE = 0x0010
+
+    ctypes.windll.user32.SetWindowPos(
+        hwnd, HWND_TOPMOST if stay_on_top else HWND_NOTOPMOST, 0, 0, 0, 0,
+        SWP_NOMOVE | SWP_NOSIZE | SWP_NOACTIVATE
+    )
+
+
+def spawn_dog_process(x, y):
+    """Start a dog in its own process at (x, y): forked by the zygote if there is one"""
+    if spawn_from_zygote(x, y):
+        print(f"Spawned new dog at ({x}, {y}) from the zygote")
+        return
+    try:
+        subprocess.Popen(
+            [PYTHON_EXE, DOG_INSTANCE_SCRIPT, str(x), str(y)],
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+        )
+        print(f"Spawned new dog at ({x}, {y})")
+    except Exception as e:
+        print(f"Failed to spawn new dog: {e}")
+
+
+def overlay_supported():
+    """True where the host's full-screen overlay can be see-through
+
+    Only the Windows colour key (apply_window_styles) hides its TRANSPARENT
+    fill; elsewhere it is an opaque magenta sheet over the whole desktop.
+    Offscreen video drivers have nothing to cover.
+    """
+    return os.name == 'nt' or os.environ.get('SDL_VIDEODRIVER') in ('dummy', 'offscreen')
+
+
+def pick_spawn_position(zones):
+    """Random standing position inside a random zone, or None without zones"""
+    return ZoneIndex.compile(zones).sample()
+
+
+class ZoneIndex:
+    """Zones compiled once per change for the queries dogs make every tick
+
+    A dog fits in a zone while its x is between the zone start and the zone
+    end minus its width, standing on the floor at the zone bottom. Those x
+    ranges are merged per floor so walking along a floor is one bisect;
+    which zone an x belongs to (the first in the list, as before) comes
+    from pre-split segments; teleport and spawn targets are drawn from
+    per-zone placements in O(1).
+    """
+    
+    _cached = (None, None)  # (rows, index) of the last compile, shared by every dog
+    
+    @staticmethod
+    def compile(zones):
+        """Index for zones (a list or the shared zone table), reused while they don't change"""
+        rows = tuple(tuple(z) for z in normalize_zones(zones))
+        if rows != ZoneIndex._cached[0]:
+            ZoneIndex._cached = (rows, ZoneIndex(rows))
+        return ZoneIndex._cached[1]
+    
+    def __init__(self, rows):
+        # Per zone: walkable x range, standing y, width left for placement
+        self.placements = []
+        for zone_start, zone_end, zone_y, zone_height in rows:
+            stand_y = zone_y + zone_height - PET_HEIGHT
+            self.placements.append((zone_start, zone_end - PET_WIDTH, stand_y))
+        
+        # stand_y -> (starts, ends) of merged walkable ranges on that floor
+        ranges = {}
+        for low, high, stand_y in self.placements:
+            if low <= high:
+                ranges.setdefault(stand_y, []).append((low, high))
+        self.floors = {}
+        for stand_y, spans in ranges.items():
+            starts, ends = [], []
+            for low, high in sorted(spans):
+                if ends and low <= ends[-1]:
+                    ends[-1] = max(ends[-1], high)
+                else:
+                    starts.append(low)
+                    ends.append(high)
+            self.floors[stand_y] = (starts, ends)
+        
+        # Owner (first zone in list order) of each breakpoint and of the gap after it
+        self.points = sorted(set(v for low, high, y in self.placements if low <= high for v in (low, high)))
+        self.point_owner = [self.first_owner(lambda low, high, p=p: low <= p <= high) for p in self.points]
+        self.gap_owner = [
+            self.first_owner(lambda low, high, a=a, b=b: low <= a and b <= high)
+            for a, b in zip(self.points, self.points[1:])
+        ]
+    
+    def first_owner(self, covers):
+        for i, (low, high, stand_y) in enumerate(self.placements):
+            if low <= high and covers(low, high):
+                return i
+        return None
+    
+    def __len__(self):
+        return len(self.placements)
+    
+    def on_floor(self, x, stand_y):
+        """True if a dog standing at y = stand_y can be at x without leaving every zone"""
+        floor = self.floors.get(stand_y)
+        if floor is None:
+            return False
+        starts, ends = floor
+        i = bisect_right(starts, x) - 1
+        return i >= 0 and x <= ends[i]
+    
+    def zone_for_x(self, x):
+        """Index of the first zone a dog at x fits in, on any floor, or None"""
+        i = bisect_left(self.points, x)
+        if i < len(self.points) and self.points[i] == x:
+            return self.point_owner[i]
+        if 0 < i < len(self.points):
+            return self.gap_owner[i - 1]
+        return None
+    
+    def zone_at(self, x, stand_y):
+        """First zone a dog standing at (x, stand_y) is in, or None
+
+        A plain scan, only used when the zones change.
+        """
+        for i, (low, high, y) in enumerate(self.placements):
+            if y == stand_y and low <= x <= high:
+                return i
+        return None
+    
+    def stand_y_for_x(self, x):
+        """Standing y in the zone that owns x, or None"""
+        i = self.zone_for_x(x)
+        return None if i is None else self.placements[i][2]
+    
+    def nearest(self, x):
+        """Closest walkable (x, stand_y) to x, or None without room anywhere
+
+        One bisect over every zone's breakpoints: x itself if a zone owns it
+        (the first in the list, as zone_for_x), else the nearer end of the
+        gap it fell in.
+        """
+        i = self.zone_for_x(x)
+        if i is not None:
+            return x, self.placements[i][2]
+        j = bisect_left(self.points, x)
+        ends = [k for k in (j - 1, j) if 0 <= k < len(self.points)]
+        if not ends:
+            return None
+        k = min(ends, key=lambda k: abs(self.points[k] - x))
+        return self.points[k], self.placements[self.point_owner[k]][2]
+    
+    def sample(self, exclude=None, rng=random):
+        """Random standing position in a random zone other than zone index exclude, or None"""
+        count = len(self.placements)
+        if count == 0:
+            return None
+        if exclude is None or count == 1:
+            i = rng.randrange(count)
+        else:
+            i = rng.randrange(count - 1)
+            if i >= exclude:
+                i += 1
+        
+        zone_start, walk_end, stand_y = self.placements[i]
+        zone_width = walk_end - zone_start
+        if zone_width > 100:
+            new_x = zone_start + rng.randint(50, zone_width - 50)
+        else:
+            new_x = zone_start + zone_width // 2
+        return new_x, stand_y
+
+
+class HitGrid:
+    """Uniform grid over screen rects for point and area lookups
+
+    Each key is filed under every cell its rect touches, so a lookup only
+    checks the few keys near the point instead of all of them, and moving
+    one rect only touches that key's cells.
+    """
+    
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}  # (col, row) -> set of keys
+        self.rects = {}  # key -> rect
+    
+    def cells_for(self, rect):
+        size = self.cell_size
+        return [(col, row)
+                for col in range(rect.left // size, (rect.right - 1) // size + 1)
+                for row in range(rect.top // size, (rect.bottom - 1) // size + 1)]
+    
+    def insert(self, key, rect):
+        self.remove(key)
+        self.rects[key] = pygame.Rect(rect)
+        for cell in self.cells_for(rect):
+            self.cells.setdefault(cell, set()).add(key)
+    
+    def remove(self, key):
+        rect = self.rects.pop(key, None)
+        if rect is not None:
+            for cell in self.cells_for(rect):
+                keys = self.cells[cell]
+                keys.discard(key)
+                if not keys:
+                    del self.cells[cell]
+    
+    def clear(self):
+        self.cells = {}
+        self.rects = {}
+    
+    def at(self, pos):
+        """Keys whose rect contains pos"""
+        cell = (pos[0] // self.cell_size, pos[1] // self.cell_size)
+        return [key for key in self.cells.get(cell, ()) if self.rects[key].collidepoint(pos)]
+    
+    def overlapping(self, rect):
+        """Keys whose rect overlaps rect"""
+        found = set()
+        for cell in self.cells_for(rect):
+            found.update(self.cells.get(cell, ()))
+        return [key for key in found if self.rects[key].colliderect(rect)]
 
 
 class ZoneEditor:
     """Full-screen overlay for editing visible zones"""
     
-    def __init__(self, zones, stay_on_top=True):
-        # Create fullscreen window
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
-        pygame.display.set_caption("Zone Editor")
+    def __init__(self, zones, stay_on_top=True, separate_window=False):
+        self.window = None
+        if separate_window:
+            self.open_separate_window()
+        else:
+            # Create fullscreen window (replaces the dog's display)
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
+            pygame.display.set_caption("Zone Editor")
+        pygame.event.set_allowed(None)  # Dogs filter events, the editor needs drags and hovers
         
         # Copy and validate zones
         self.zones = []
@@ -266,25 +1106,26 @@ class ZoneEditor:
         self.result = None  # Will store 'save', 'add_dog', or None
         self.handle_width = 20
         
-        # Make window topmost
-        try:
-            import ctypes
-            hwnd = pygame.display.get_wm_info()['window']
-            
-            GWL_EXSTYLE = -20
-            WS_EX_LAYERED = 0x00080000
-            LWA_ALPHA = 0x00000002
-            
-            style = ctypes.windll.user32.GetWindowLongW(hwnd, GWL_EXSTYLE)
-            ctypes.windll.user32.SetWindowLongW(hwnd, GWL_EXSTYLE, style | WS_EX_LAYERED)
-            ctypes.windll.user32.SetLayeredWindowAttributes(hwnd, 0, 180, LWA_ALPHA)
-            
-            HWND_TOPMOST = -1
-            SWP_NOMOVE = 0x0002
-            SWP_NOSIZE = 0x0001
-            ctypes.windll.user32.SetWindowPos(hwnd, HWND_TOPMOST, 0, 0, 0, 0, SWP_NOMOVE | SWP_NOSIZE)
-        except:
-            pass
+        # Make window topmost (the separate window got always_on_top and opacity from SDL)
+        if self.window is None:
+            try:
+                import ctypes
+                hwnd = pygame.display.get_wm_info()['window']
+                
+                GWL_EXSTYLE = -20
+                WS_EX_LAYERED = 0x00080000
+                LWA_ALPHA = 0x00000002
+                
+                style = ctypes.windll.user32.GetWindowLongW(hwnd, GWL_EXSTYLE)
+                ctypes.windll.user32.SetWindowLongW(hwnd, GWL_EXSTYLE, style | WS_EX_LAYERED)
+                ctypes.windll.user32.SetLayeredWindowAttributes(hwnd, 0, 180, LWA_ALPHA)
+                
+                HWND_TOPMOST = -1
+                SWP_NOMOVE = 0x0002
+                SWP_NOSIZE = 0x0001
+                ctypes.windll.user32.SetWindowPos(hwnd, HWND_TOPMOST, 0, 0, 0, 0, SWP_NOMOVE | SWP_NOSIZE)
+            except:
+                pass
         
         self.font = pygame.font.SysFont('Arial', 16)
         self.title_font = pygame.font.SysFont('Arial', 24, bold=True)
@@ -294,6 +1135,179 @@ class ZoneEditor:
         self.cancel_btn = pygame.Rect(SCREEN_WIDTH//2 + 80, 100, 100, 40)
         self.add_zone_btn = pygame.Rect(SCREEN_WIDTH//2 - 60, 150, 120, 35)
         self.add_dog_btn = pygame.Rect(SCREEN_WIDTH//2 - 100, 200, 200, 45)  # New button
+        
+        # Retained mode: the static chrome and text are rendered once, and
+        # only the areas a drag or hover change touched get repainted
+        self.chrome = self.render_chrome()
+        self.x_text = self.font.render("×", True, WHITE)
+        self.number_cache = {}  # zone index -> rendered number
+        self.label_cache = {}  # zone index -> (label text, rendered label)
+        self.dirty = []
+        self.full_redraw = True
+        
+        # Hit testing and repaint lookups go through a grid of zone bounds
+        # instead of scanning every zone
+        self.grid = HitGrid()
+        self.zone_rects = []  # zone index -> (left handle, right handle, delete button, body)
+        self.rebuild_index()
+    
+    def open_separate_window(self):
+        """Editor in a second SDL window, so the dog's window and frames stay as they are
+
+        Draws into an off-screen surface that is shown through a texture.
+        Raises if this pygame/SDL can't do it; the caller then falls back to
+        replacing the display.
+        """
+        from pygame._sdl2 import video
+        self.window = video.Window("Zone Editor", size=(SCREEN_WIDTH, SCREEN_HEIGHT),
+                                   fullscreen_desktop=True, always_on_top=True)
+        try:
+            self.renderer = video.Renderer(self.window)
+            self.texture = video.Texture(self.renderer, (SCREEN_WIDTH, SCREEN_HEIGHT), streaming=True)
+        except Exception:
+            self.close()
+            raise
+        
+        try:
+            self.window.opacity = 180 / 255  # Same see-through look as the layered window
+        except Exception:
+            pass  # Not every video driver can do it
+        self.window.focus()
+        self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)  # Texture's ARGB layout, uploads without converting
+    
+    def close(self):
+        """Destroy the separate editor window, if there is one"""
+        if self.window is not None:
+            self.window.destroy()
+            self.window = None
+    
+    def present(self, rects=None):
+        """Put what draw() painted on screen: everything, or only rects"""
+        if self.window is None:
+            if rects is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+            return
+        
+        if rects is None:
+            self.texture.update(self.screen)
+        else:
+            for rect in rects:
+                if rect.width and rect.height:
+                    self.texture.update(self.screen.subsurface(rect), rect)
+        self.texture.draw()
+        self.renderer.present()
+    
+    def render_chrome(self):
+        """Background, taskbar, title, instructions and buttons (zones go on top)"""
+        chrome = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        chrome.fill((20, 20, 30))
+        
+        # Draw taskbar reference
+        taskbar_rect = pygame.Rect(0, SCREEN_HEIGHT - 60, SCREEN_WIDTH, 60)
+        pygame.draw.rect(chrome, (40, 40, 50), taskbar_rect)
+        pygame.draw.rect(chrome, (100, 100, 100), taskbar_rect, 2)
+        
+        # Title
+        title = self.title_font.render("ZONE EDITOR - Set where the dog can walk", True, WHITE)
+        chrome.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 20))
+        
+        instructions1 = self.font.render("Drag handles to resize | Drag zone to move | Click X to delete", True, (180, 180, 180))
+        instructions2 = self.font.render("Green zones = where dog is visible | Place zones anywhere on screen!", True, (120, 220, 120))
+        chrome.blit(instructions1, (SCREEN_WIDTH//2 - instructions1.get_width()//2, 52))
+        chrome.blit(instructions2, (SCREEN_WIDTH//2 - instructions2.get_width()//2, 72))
+        
+        # Buttons
+        pygame.draw.rect(chrome, (40, 120, 40), self.save_btn, border_radius=5)
+        pygame.draw.rect(chrome, (120, 40, 40), self.cancel_btn, border_radius=5)
+        pygame.draw.rect(chrome, (60, 60, 120), self.add_zone_btn, border_radius=5)
+        pygame.draw.rect(chrome, (120, 80, 200), self.add_dog_btn, border_radius=5)  # Purple button
+        
+        save_text = self.font.render("SAVE", True, WHITE)
+        cancel_text = self.font.render("CANCEL", True, WHITE)
+        add_zone_text = self.font.render("+ Add Zone", True, WHITE)
+        add_dog_text = self.title_font.render("+ Add Another Dog", True, WHITE)
+        
+        chrome.blit(save_text, (self.save_btn.centerx - save_text.get_width()//2, self.save_btn.centery - save_text.get_height()//2))
+        chrome.blit(cancel_text, (self.cancel_btn.centerx - cancel_text.get_width()//2, self.cancel_btn.centery - cancel_text.get_height()//2))
+        chrome.blit(add_zone_text, (self.add_zone_btn.centerx - add_zone_text.get_width()//2, self.add_zone_btn.centery - add_zone_text.get_height()//2))
+        chrome.blit(add_dog_text, (self.add_dog_btn.centerx - add_dog_text.get_width()//2, self.add_dog_btn.centery - add_dog_text.get_height()//2))
+        return chrome
+    
+    def zone_number(self, i):
+        if i not in self.number_cache:
+            self.number_cache[i] = self.title_font.render(str(i+1), True, (255, 255, 0))
+        return self.number_cache[i]
+    
+    def zone_label(self, i):
+        """Rendered 'Zone i: x:..' label, re-rendered only when the zone changes"""
+        x1, x2, y, height = self.zones[i][:4]
+        label_text = f"Zone {i+1}: x:{x1}-{x2} y:{y} h:{height}"
+        cached = self.label_cache.get(i)
+        if cached is None or cached[0] != label_text:
+            cached = (label_text, self.font.render(label_text, True, WHITE))
+            self.label_cache[i] = cached
+        return cached[1]
+    
+    def zone_text_positions(self, i):
+        """Top-left corners of zone i's number and label"""
+        x1, x2, y, height = self.zones[i][:4]
+        label = self.zone_label(i)
+        label_x = max(x1 + 10, min(x1 + 10, x2 - label.get_width() - 10))
+        label_y = y + height // 2 - label.get_height() // 2
+        return (x1 + (x2 - x1)//2 - 10, y - 30), (label_x, label_y)
+    
+    def zone_bounds(self, i):
+        """Screen area zone i paints: body, handles, number and label"""
+        return self.grid.rects[i]
+    
+    def update_zone(self, i):
+        """Refresh zone i's cached rects and grid entry after it moved or resized"""
+        left_h, right_h, delete_btn = self.get_handle_rects(i)
+        x1, x2, y, height = self.zones[i][:4]
+        body = pygame.Rect(x1, y, x2 - x1, height)
+        self.zone_rects[i] = (left_h, right_h, delete_btn, body)
+        
+        number_pos, label_pos = self.zone_text_positions(i)
+        self.grid.insert(i, body.unionall([
+            left_h, right_h, delete_btn,
+            self.zone_number(i).get_rect(topleft=number_pos),
+            self.zone_label(i).get_rect(topleft=label_pos),
+        ]))
+    
+    def rebuild_index(self):
+        """Re-file every zone, needed when zones are added or removed (indices shift)"""
+        self.grid.clear()
+        self.zone_rects = [None] * len(self.zones)
+        for i in range(len(self.zones)):
+            self.update_zone(i)
+    
+    def hit_test(self, pos, include_delete=False):
+        """(zone index, part) under pos, or None; earlier zones win like the old linear scan"""
+        for i in sorted(self.grid.at(pos)):
+            left_h, right_h, delete_btn, body = self.zone_rects[i]
+            if include_delete and delete_btn.collidepoint(pos) and len(self.zones) > 1:
+                return (i, 'delete')
+            elif left_h.collidepoint(pos):
+                return (i, 'left')
+            elif right_h.collidepoint(pos):
+                return (i, 'right')
+            elif body.collidepoint(pos):
+                return (i, 'body')
+        return None
+    
+    def mark_dirty(self, rect):
+        """Queue an area for repainting, merged with any queued area it touches"""
+        for j, queued in enumerate(self.dirty):
+            if queued.colliderect(rect):
+                self.dirty[j] = queued.union(rect)
+                return
+        self.dirty.append(rect)
+    
+    def mark_zone(self, i):
+        if i is not None and 0 <= i < len(self.zones):
+            self.mark_dirty(self.zone_bounds(i))
     
     def get_handle_rects(self, zone_idx):
         """Get the draggable handle rectangles for a zone"""
@@ -308,10 +1322,13 @@ class ZoneEditor:
     
     def run(self):
         clock = pygame.time.Clock()
+        self.draw()
         
         while self.running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+            # Nothing animates here, so sleep until there's input
+            events = [pygame.event.wait()] + pygame.event.get()
+            for event in events:
+                if event.type in (pygame.QUIT, pygame.WINDOWCLOSE):
                     self.running = False
                     return None
                 
@@ -342,56 +1359,53 @@ class ZoneEditor:
                             new_y = SCREEN_HEIGHT // 2 - 30
                             new_height = 60
                             self.zones.append([new_start, new_end, new_y, new_height])
+                            self.rebuild_index()
+                            self.full_redraw = True  # Delete buttons appear once there are two zones
                         elif self.add_dog_btn.collidepoint(mx, my):  # New button handler
                             self.result = 'add_dog'
                             self.running = False
                             return self.zones
                         
                         # Check zone handles
-                        for i, zone in enumerate(self.zones):
-                            left_h, right_h, delete_btn = self.get_handle_rects(i)
-                            zone_body = pygame.Rect(zone[0], zone[2], zone[1] - zone[0], zone[3])
-                            
-                            if delete_btn.collidepoint(mx, my) and len(self.zones) > 1:
-                                self.zones.pop(i)
-                                break
-                            elif left_h.collidepoint(mx, my):
-                                self.dragging = (i, 'left')
-                                break
-                            elif right_h.collidepoint(mx, my):
-                                self.dragging = (i, 'right')
-                                break
-                            elif zone_body.collidepoint(mx, my):
-                                self.dragging = (i, 'body')
+                        hit = self.hit_test((mx, my), include_delete=True)
+                        if hit and hit[1] == 'delete':
+                            self.zones.pop(hit[0])
+                            self.label_cache = {}  # Later zones are renumbered
+                            self.rebuild_index()
+                            self.full_redraw = True
+                        elif hit:
+                            i, part = hit
+                            self.dragging = hit
+                            if part == 'body':
+                                zone = self.zones[i]
                                 self.drag_offset = (mx - zone[0], my - zone[2])
-                                break
+                            self.mark_zone(i)
                 
                 elif event.type == pygame.MOUSEBUTTONUP:
+                    if self.dragging:
+                        self.mark_zone(self.dragging[0])
                     self.dragging = None
                 
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    self.full_redraw = True
+                
                 elif event.type == pygame.MOUSEMOTION:
                     mx, my = event.pos
                     
                     # Update hover state
+                    old_hover = self.hover
                     self.hover = None
                     if not self.dragging:
-                        for i, zone in enumerate(self.zones):
-                            left_h, right_h, delete_btn = self.get_handle_rects(i)
-                            zone_body = pygame.Rect(zone[0], zone[2], zone[1] - zone[0], zone[3])
-                            
-                            if left_h.collidepoint(mx, my):
-                                self.hover = (i, 'left')
-                                break
-                            elif right_h.collidepoint(mx, my):
-                                self.hover = (i, 'right')
-                                break
-                            elif zone_body.collidepoint(mx, my):
-                                self.hover = (i, 'body')
-                                break
+                        self.hover = self.hit_test((mx, my))
+                    
+                    if self.hover != old_hover:
+                        self.mark_zone(old_hover[0] if old_hover else None)
+                        self.mark_zone(self.hover[0] if self.hover else None)
                     
                     if self.dragging:
                         zone_idx, side = self.dragging
                         zone = self.zones[zone_idx]
+                        self.mark_zone(zone_idx)  # Where it was
                         
                         if side == 'left':
                             new_val = max(0, min(mx, zone[1] - 50))
@@ -414,109 +1428,114 @@ class ZoneEditor:
                             zone[1] = new_x + zone_width
                             zone[2] = new_y
                             zone[3] = zone_height
+                        
+                        self.update_zone(zone_idx)
+                        self.mark_zone(zone_idx)  # Where it is now
             
             self.draw()
-            clock.tick(60)
+            clock.tick(60)  # Caps repaints during a drag
         
         return None
     
     def draw(self):
-        self.screen.fill((20, 20, 30))
+        """Repaint whatever changed since the last call"""
+        if self.full_redraw:
+            self.screen.blit(self.chrome, (0, 0))
+            for i in range(len(self.zones)):
+                self.draw_zone(i)
+            self.present()
+        elif self.dirty:
+            screen_rect = self.screen.get_rect()
+            dirty = [rect.clip(screen_rect) for rect in self.dirty]
+            for rect in dirty:
+                # Chrome underneath, then every zone that reaches in, in stacking order
+                self.screen.set_clip(rect)
+                self.screen.blit(self.chrome, rect, rect)
+                for i in sorted(self.grid.overlapping(rect)):
+                    self.draw_zone(i)
+            self.screen.set_clip(None)
+            self.present(dirty)
         
-        # Draw taskbar reference
-        taskbar_rect = pygame.Rect(0, SCREEN_HEIGHT - 60, SCREEN_WIDTH, 60)
-        pygame.draw.rect(self.screen, (40, 40, 50), taskbar_rect)
-        pygame.draw.rect(self.screen, (100, 100, 100), taskbar_rect, 2)
+        self.full_redraw = False
+        self.dirty = []
+    
+    def draw_zone(self, i):
+        zone = self.zones[i]
+        if len(zone) < 2 or zone[0] >= zone[1]:
+            return
         
-        # Title
-        title = self.title_font.render("ZONE EDITOR - Set where the dog can walk", True, WHITE)
-        self.screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 20))
+        x1, x2, y, height = zone[0], zone[1], zone[2], zone[3]
+        zone_width = x2 - x1
+        zone_rect = pygame.Rect(x1, y, zone_width, height)
         
-        instructions1 = self.font.render("Drag handles to resize | Drag zone to move | Click X to delete", True, (180, 180, 180))
-        instructions2 = self.font.render("Green zones = where dog is visible | Place zones anywhere on screen!", True, (120, 220, 120))
-        self.screen.blit(instructions1, (SCREEN_WIDTH//2 - instructions1.get_width()//2, 52))
-        self.screen.blit(instructions2, (SCREEN_WIDTH//2 - instructions2.get_width()//2, 72))
+        is_active = self.dragging == (i, 'body') or self.hover == (i, 'body')
+        zone_color = (60, 140, 60) if is_active else (40, 100, 40)
+        border_color = (100, 255, 100) if is_active else (80, 200, 80)
+        border_width = 4 if is_active else 3
         
-        # Buttons
-        pygame.draw.rect(self.screen, (40, 120, 40), self.save_btn, border_radius=5)
-        pygame.draw.rect(self.screen, (120, 40, 40), self.cancel_btn, border_radius=5)
-        pygame.draw.rect(self.screen, (60, 60, 120), self.add_zone_btn, border_radius=5)
-        pygame.draw.rect(self.screen, (120, 80, 200), self.add_dog_btn, border_radius=5)  # Purple button
+        pygame.draw.rect(self.screen, zone_color, zone_rect)
+        pygame.draw.rect(self.screen, border_color, zone_rect, border_width)
         
-        save_text = self.font.render("SAVE", True, WHITE)
-        cancel_text = self.font.render("CANCEL", True, WHITE)
-        add_zone_text = self.font.render("+ Add Zone", True, WHITE)
-        add_dog_text = self.title_font.render("+ Add Another Dog", True, WHITE)
+        # Zone number
+        number_pos, label_pos = self.zone_text_positions(i)
+        self.screen.blit(self.zone_number(i), number_pos)
         
-        self.screen.blit(save_text, (self.save_btn.centerx - save_text.get_width()//2, self.save_btn.centery - save_text.get_height()//2))
-        self.screen.blit(cancel_text, (self.cancel_btn.centerx - cancel_text.get_width()//2, self.cancel_btn.centery - cancel_text.get_height()//2))
-        self.screen.blit(add_zone_text, (self.add_zone_btn.centerx - add_zone_text.get_width()//2, self.add_zone_btn.centery - add_zone_text.get_height()//2))
-        self.screen.blit(add_dog_text, (self.add_dog_btn.centerx - add_dog_text.get_width()//2, self.add_dog_btn.centery - add_dog_text.get_height()//2))
+        # Handles
+        left_h, right_h, delete_btn = self.zone_rects[i][:3]
         
-        # Draw zones
-        for i, zone in enumerate(self.zones):
-            if len(zone) < 2 or zone[0] >= zone[1]:
-                continue
-            
-            x1, x2, y, height = zone[0], zone[1], zone[2], zone[3]
-            zone_width = x2 - x1
-            zone_rect = pygame.Rect(x1, y, zone_width, height)
-            
-            is_active = self.dragging == (i, 'body') or self.hover == (i, 'body')
-            zone_color = (60, 140, 60) if is_active else (40, 100, 40)
-            border_color = (100, 255, 100) if is_active else (80, 200, 80)
-            border_width = 4 if is_active else 3
-            
-            pygame.draw.rect(self.screen, zone_color, zone_rect)
-            pygame.draw.rect(self.screen, border_color, zone_rect, border_width)
-            
-            # Zone number
-            zone_num_text = self.title_font.render(str(i+1), True, (255, 255, 0))
-            self.screen.blit(zone_num_text, (x1 + zone_width//2 - 10, y - 30))
-            
-            # Handles
-            left_h, right_h, delete_btn = self.get_handle_rects(i)
-            
-            is_left_active = self.dragging == (i, 'left') or self.hover == (i, 'left')
-            handle_color = (255, 220, 120) if is_left_active else (200, 150, 50)
-            pygame.draw.rect(self.screen, handle_color, left_h, border_radius=4)
-            pygame.draw.rect(self.screen, WHITE, left_h, 3 if is_left_active else 2, border_radius=4)
-            
-            is_right_active = self.dragging == (i, 'right') or self.hover == (i, 'right')
-            handle_color = (255, 220, 120) if is_right_active else (200, 150, 50)
-            pygame.draw.rect(self.screen, handle_color, right_h, border_radius=4)
-            pygame.draw.rect(self.screen, WHITE, right_h, 3 if is_right_active else 2, border_radius=4)
-            
-            # Delete button
-            if len(self.zones) > 1:
-                pygame.draw.rect(self.screen, (150, 50, 50), delete_btn, border_radius=3)
-                x_text = self.font.render("×", True, WHITE)
-                self.screen.blit(x_text, (delete_btn.centerx - x_text.get_width()//2, delete_btn.centery - x_text.get_height()//2 - 2))
-            
-            # Zone label
-            label_text = f"Zone {i+1}: x:{x1}-{x2} y:{y} h:{height}"
-            label = self.font.render(label_text, True, WHITE)
-            label_x = max(x1 + 10, min(x1 + 10, x2 - label.get_width() - 10))
-            label_y = y + height // 2 - label.get_height() // 2
-            self.screen.blit(label, (label_x, label_y))
+        is_left_active = self.dragging == (i, 'left') or self.hover == (i, 'left')
+        handle_color = (255, 220, 120) if is_left_active else (200, 150, 50)
+        pygame.draw.rect(self.screen, handle_color, left_h, border_radius=4)
+        pygame.draw.rect(self.screen, WHITE, left_h, 3 if is_left_active else 2, border_radius=4)
         
-        pygame.display.flip()
+        is_right_active = self.dragging == (i, 'right') or self.hover == (i, 'right')
+        handle_color = (255, 220, 120) if is_right_active else (200, 150, 50)
+        pygame.draw.rect(self.screen, handle_color, right_h, border_radius=4)
+        pygame.draw.rect(self.screen, WHITE, right_h, 3 if is_right_active else 2, border_radius=4)
+        
+        # Delete button
+        if len(self.zones) > 1:
+            pygame.draw.rect(self.screen, (150, 50, 50), delete_btn, border_radius=3)
+            x_text = self.x_text
+            self.screen.blit(x_text, (delete_btn.centerx - x_text.get_width()//2, delete_btn.centery - x_text.get_height()//2 - 2))
+        
+        # Zone label
+        self.screen.blit(self.zone_label(i), label_pos)
 
 
 
 class Dog:
     """Single dog instance"""
-    def __init__(self, start_x=None, start_y=None):
-        settings = load_settings()
+    def __init__(self, start_x=None, start_y=None, host=None, headless=False, clock=None,
+                 seed=None, settings=None, trace=None):
+        # A headless dog has no window, bus or settings watch and is driven by
+        # simulate() on a SimClock (SDL_VIDEODRIVER=dummy where there is no display)
+        self.headless = headless
         
-        # Visible zones
-        zones = settings.get('zones', [[0, 450, GROUND_Y, 60], [SCREEN_WIDTH - 300, SCREEN_WIDTH, GROUND_Y, 60]])
-        self.visible_zones = []
-        for z in zones:
-            if len(z) >= 4:
-                self.visible_zones.append(list(z))
-            else:
-                self.visible_zones.append([z[0], z[1], GROUND_Y, 60])
+        # Every random choice comes from this dog's own generator, so a run
+        # can be repeated from its seed (see dog_trace.py)
+        self.seed = seed if seed is not None else random.randrange(2 ** 64)
+        self.rng = random.Random(self.seed)
+        if trace is None and not headless and os.environ.get('SCHNAUZER_TRACE_DIR'):
+            trace = os.path.join(os.environ['SCHNAUZER_TRACE_DIR'], f"dog-{os.getpid()}-{self.seed}.trace")
+        
+        # Zone changes from the launcher or other dogs are picked up by revision;
+        # a dog given its settings never reads the file
+        if settings is None:
+            self.settings_reader = settings_store.SettingsReader(SETTINGS_FILE)
+            settings = load_settings(self.settings_reader)
+        else:
+            self.settings_reader = None
+        
+        # Visible zones, from the shared table when there is one
+        zones = normalize_zones(settings.get('zones', [[0, 450, GROUND_Y, 60], [SCREEN_WIDTH - 300, SCREEN_WIDTH, GROUND_Y, 60]]))
+        self.zone_table = None if headless else shared_zones()  # A simulation must not move real dogs
+        self.zones_seen = None
+        self.visible_zones = zones
+        if self.zone_table is not None:
+            self.set_zones(zones, settings.get('revision', 0))
+            self.visible_zones = self.zone_table
+        self.zone_index = ZoneIndex.compile(self.visible_zones)
         
         self.stay_on_top = settings.get('stay_on_top', True)
         
@@ -538,55 +1557,20 @@ class Dog:
             self.x = start_x
             self.y = start_y
         
-        # Create window
-        os.environ['SDL_VIDEO_WINDOW_POS'] = f'{int(self.x)},{int(self.y)}'
-        self.screen = pygame.display.set_mode((PET_WIDTH, PET_HEIGHT), pygame.NOFRAME)
-        pygame.display.set_caption(f"Schnauzer Pet")
-        
-        # Set window properties
-        try:
-            import ctypes
-            hwnd = pygame.display.get_wm_info()['window']
-
-            GWL_EXSTYLE = -20
-            WS_EX_LAYERED = 0x00080000
-            WS_EX_TOOLWINDOW = 0x00000080
-            LWA_COLORKEY = 0x00000001
-
-            style = ctypes.windll.user32.GetWindowLongW(hwnd, GWL_EXSTYLE)
-            style = style | WS_EX_LAYERED | WS_EX_TOOLWINDOW
-            ctypes.windll.user32.SetWindowLongW(hwnd, GWL_EXSTYLE, style)
-
-            ctypes.windll.user32.SetLayeredWindowAttributes(
-                hwnd,
-                0x00FF00FF,
-                0,
-                LWA_COLORKEY
-            )
-            
-            HWND_TOPMOST = -1
-            HWND_NOTOPMOST = -2
-            SWP_NOMOVE = 0x0002
-            SWP_NOSIZE = 0x0001
-            SWP_NOACTIVATE = 0x0010
-
-            if self.stay_on_top:
-                ctypes.windll.user32.SetWindowPos(
-                    hwnd, HWND_TOPMOST, 0, 0, 0, 0,
-                    SWP_NOMOVE | SWP_NOSIZE | SWP_NOACTIVATE
-                )
-            else:
-                ctypes.windll.user32.SetWindowPos(
-                    hwnd, HWND_NOTOPMOST, 0, 0, 0, 0,
-                    SWP_NOMOVE | SWP_NOSIZE | SWP_NOACTIVATE
-                )
-            
-            self.hwnd = hwnd
-            self.can_move_window = True
-        except Exception as e:
-            print(f"Compatibility mode: {e}")
-            self.can_move_window = False
-            self.hwnd = None
+        # Dogs inside a DogHost draw onto the host's shared overlay window
+        self.host = host
+        self.screen = None
+        self.hwnd = None
+        self.can_move_window = False
+        self.last_presented = None
+        if headless:
+            self.screen = pygame.Surface((PET_WIDTH, PET_HEIGHT))
+            # Set before any frame is built: the builders never need a display,
+            # and frames are converted to the layout convert_alpha() gives on a
+            # usual 32-bit display instead of the (missing) window's
+            SchauzerSprites.convert_for_display(pygame.Surface((1, 1), pygame.SRCALPHA, 32))
+        elif host is None:
+            self.create_window()
         
         # State
         self.state = "idle"
@@ -595,16 +1579,13 @@ class Dog:
         self.frame_timer = 0
         self.state_timer = 0
         
-        # Load animations
-        self.animations = {
-            'idle': SchauzerSprites.create_idle_frames(),
-            'walk': SchauzerSprites.create_walk_frames(),
-            'sit': SchauzerSprites.create_sit_frames(),
-            'backflip': SchauzerSprites.create_backflip_frames(),
-            'poop': SchauzerSprites.create_poop_frames(),
-            'portal_out': SchauzerSprites.create_portal_out_frames(),
-            'portal_in': SchauzerSprites.create_portal_in_frames(),
-        }
+        # Load animations (shared by every dog in this process). Only idle is
+        # ready at first paint, the rest load in the background (all up front
+        # headless or traced, so a run doesn't depend on the loader's pace)
+        backflip_steps = settings.get('backflip_steps', SchauzerSprites.BACKFLIP_STEPS)
+        self.animations = SchauzerSprites.load_animations(
+            backflip_steps, background=not (headless or trace))
+        self.mirrored_animations = SchauzerSprites.load_mirrored_animations()
         
         self.tricks = ['backflip', 'sit', 'poop']
         self.trick_index = 0
@@ -614,28 +1595,63 @@ class Dog:
         self.teleport_target_y = None
         
         self.poops = []
-        self.clock = pygame.time.Clock()
+        self.clock = clock or (SimClock() if headless else pygame.time.Clock())
+        self.loop_stats = LoopStats()
+        
+        self.paused = False
         
-        # Track settings file modification time for zone sharing
-        self.settings_mtime = os.path.getmtime(SETTINGS_FILE) if os.path.exists(SETTINGS_FILE) else 0
-        self.zone_check_timer = 0  # Check for zone updates every 2 seconds
+        # The launcher and other dogs push settings changes over the control
+        # bus; a host joins it once for all of its dogs
+        if headless:
+            self.on_bus = False
+        elif host is None:
+            self.on_bus = start_control_bus('dog', lambda: {'dogs': [self.info()], 'loop': self.loop_stats.snapshot()})
+        else:
+            self.on_bus = host.on_bus
+        
+        # Check for zone updates every 2 seconds, unless the file watcher tells
+        # us. Broadcasts over the bus don't cover hand edits or a peer that
+        # timed out, so dogs on it still poll, less often
+        self.zone_check_timer = 0
+        if not headless and watch_settings():
+            self.zone_check_interval = None
+        else:
+            self.zone_check_interval = BUS_ZONE_CHECK_INTERVAL if self.on_bus else ZONE_CHECK_INTERVAL
+        
+        self.trace = None
+        if trace is not None:
+            try:
+                self.trace = dog_trace.Recorder(trace, self.seed, self.x, self.y, {
+                    'zones': [list(zone) for zone in self.visible_zones], 'backflip_steps': backflip_steps})
+            except OSError as e:
+                print(f"Could not start the behaviour trace: {e}")
+        
+        self.check_settings()  # Saved while this dog was starting up
         
         # AI Logic
-        self.next_action_delay = random.randint(2000, 4000) # Act every 2-4 seconds
+        self.next_action_delay = self.rng.randint(2000, 4000) # Act every 2-4 seconds
+    
+    def create_window(self):
+        """Open this dog's own borderless 200x200 window at its position"""
+        os.environ['SDL_VIDEO_WINDOW_POS'] = f'{int(self.x)},{int(self.y)}'
+        self.screen = pygame.display.set_mode((PET_WIDTH, PET_HEIGHT), pygame.NOFRAME)
+        pygame.display.set_caption(f"Schnauzer Pet")
+        SchauzerSprites.convert_for_display()
+        
+        # Set window properties
+        try:
+            self.hwnd = apply_window_styles(self.stay_on_top)
+            self.can_move_window = True
+        except Exception as e:
+            print(f"Compatibility mode: {e}")
+            self.can_move_window = False
+            self.hwnd = None
+        self._last_window_pos = (int(self.x), int(self.y))
+        self.last_presented = None  # New window, nothing shown yet
     
     def is_in_visible_zone(self):
-        for zone in self.visible_zones:
-            if len(zone) >= 4:
-                zone_start, zone_end, zone_y, zone_height = zone[0], zone[1], zone[2], zone[3]
-                x_in_range = zone_start <= self.x <= zone_end - PET_WIDTH
-                y_in_range = zone_y <= self.y < zone_y + zone_height
-                if x_in_range and y_in_range:
-                    return True
-            else:
-                zone_start, zone_end = zone[0], zone[1]
-                if zone_start <= self.x <= zone_end - PET_WIDTH:
-                    return True
-        return False
+        """True if the dog stands somewhere it may walk"""
+        return self.zone_index.on_floor(self.x, self.y)
     
     def move_window(self, x, y):
         if self.can_move_window and self.hwnd:
@@ -665,40 +1681,23 @@ class Dog:
     
     def teleport_to_random_zone(self):
         """Teleport to a random zone"""
+        target = self.zone_index.sample(exclude=self.zone_index.zone_for_x(self.x), rng=self.rng)
+        if target is not None:
+            self.teleport_to(target)
+    
+    def teleport_to(self, target):
+        """Portal out and back in at target (x, stand_y)"""
+        target_x, target_y = target
 
-
-        current_zone_idx = None
-        for i, zone in enumerate(self.visible_zones):
-            if len(zone) >= 4:
-                zone_start, zone_end = zone[0], zone[1]
-            else:
-                zone_start, zone_end = zone[0], zone[1]
-
-            if zone_start <= self.x <= zone_end - PET_WIDTH:
-                current_zone_idx = i
-                break
-
-        available_zones = [i for i in range(len(self.visible_zones)) if i != current_zone_idx]
-        if not available_zones:
-            available_zones = list(range(len(self.visible_zones)))
-
-        new_zone_idx = random.choice(available_zones)
-        new_zone = self.visible_zones[new_zone_idx]
-
-        if len(new_zone) >= 4:
-            zone_start, zone_end, zone_y, zone_height = new_zone[0], new_zone[1], new_zone[2], new_zone[3]
-        else:
-            zone_start, zone_end = new_zone[0], new_zone[1]
-            zone_y = GROUND_Y
-            zone_height = 60
-
-        zone_width = zone_end - zone_start - PET_WIDTH
-        if zone_width > 100:
-            target_x = zone_start + random.randint(50, zone_width - 50)
-        else:
-            target_x = zone_start + zone_width // 2
-
-        target_y = zone_y + zone_height - PET_HEIGHT
+        if not (self.animation_ready('portal_out') and self.animation_ready('portal_in')):
+            # Portal frames are still loading, jump without the effect
+            SchauzerSprites.prefetch('portal_out', 'portal_in')
+            self.x = target_x
+            self.y = target_y
+            self.move_window(self.x, self.y)
+            self.state = 'idle'
+            self.state_timer = 0
+            return
 
         self.teleporting = True
         self.teleport_target_x = target_x
@@ -707,85 +1706,206 @@ class Dog:
         self.frame = 0
         self.frame_timer = 0
 
+    def animation_ready(self, name):
+        return name in self.animations
+
     def do_trick(self):
         trick = self.tricks[self.trick_index]
+        if not self.animation_ready(trick):
+            # Still loading: stay idle and ask for it to be loaded next
+            SchauzerSprites.prefetch(trick)
+            return
         self.state = trick
         self.frame = 0
         self.frame_timer = 0
         self.trick_index = (self.trick_index + 1) % len(self.tricks)
     
     def spawn_new_dog(self):
-        """Spawn a new dog process at a random position"""
-        if self.visible_zones:
-            zone = random.choice(self.visible_zones)
-            if len(zone) >= 4:
-                zone_start, zone_end, zone_y, zone_height = zone[0], zone[1], zone[2], zone[3]
-            else:
-                zone_start, zone_end = zone[0], zone[1]
-                zone_y = GROUND_Y
-                zone_height = 60
-            
-            # Random position within zone
-            zone_width = zone_end - zone_start - PET_WIDTH
-            if zone_width > 100:
-                new_x = zone_start + random.randint(50, zone_width - 50)
-            else:
-                new_x = zone_start + zone_width // 2
-            new_y = zone_y + zone_height - PET_HEIGHT
-            
-            # Spawn new process
-            try:
-                subprocess.Popen(
-                    [PYTHON_EXE, DOG_INSTANCE_SCRIPT, str(new_x), str(new_y)],
-                    creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-                )
-                print(f"Spawned new dog at ({new_x}, {new_y})")
-            except Exception as e:
-                print(f"Failed to spawn new dog: {e}")
-                
-    def update(self, dt):
-        # Check for zone updates from other dog instances (every 2 seconds)
-        self.zone_check_timer += dt
-        if self.zone_check_timer >= 2000:  # Check every 2 seconds
-            self.zone_check_timer = 0
-            try:
-                if os.path.exists(SETTINGS_FILE):
-                    current_mtime = os.path.getmtime(SETTINGS_FILE)
-                    if current_mtime > self.settings_mtime:
-                        # Settings file has been updated, reload zones
-                        self.settings_mtime = current_mtime
-                        settings = load_settings()
-                        new_zones = settings.get('zones', [])
-                        if new_zones:
-                            # Convert zones to proper format
-                            self.visible_zones = []
-                            for z in new_zones:
-                                if len(z) >= 4:
-                                    self.visible_zones.append(list(z))
-                                else:
-                                    self.visible_zones.append([z[0], z[1], GROUND_Y, 60])
-                            
-                            print(f"Zones updated from settings file: {len(self.visible_zones)} zones loaded")
-                            
-                            # Valid zones exist, teleport to safety immediately
-                            if self.visible_zones:
-                                print("Zones changed - teleporting to new valid location...")
-                                self.teleport_to_random_zone()
-            except Exception as e:
-                print(f"Error checking for zone updates: {e}")
+        """Spawn a new dog at a random position (a new process, or a new entity in a host)"""
+        position = self.zone_index.sample(rng=self.rng)
+        if position is None:
+            return
+        new_x, new_y = position
         
-        self.frame_timer += dt
-        self.state_timer += dt
+        if self.headless:
+            print(f"Would spawn a new dog at ({new_x}, {new_y})")
+            return
+        if self.host is not None:
+            self.host.add_dog(new_x, new_y)
+            return
         
-        frame_duration = 100 if self.state == 'walk' else 150
+        # A resident zygote (Linux) forks a ready dog in a fraction of a cold start
+        spawn_dog_process(new_x, new_y)
+                
+    def frame_duration(self):
+        """Milliseconds each frame of the current state stays on screen"""
         if self.state == 'backflip':
-            frame_duration = 50
+            # Same 600 ms flip whatever the number of rotation steps
+            return max(1, BACKFLIP_TIME // len(self.animations['backflip']))
         elif self.state == 'portal_out':
-            frame_duration = 50
+            return 50
         elif self.state == 'portal_in':
-            frame_duration = 100
+            return 100
+        return 100 if self.state == 'walk' else 150
+    
+    def time_until_update(self):
+        """Milliseconds until update() next has something to do (0 = every tick)"""
+        if self.paused:
+            if self.zone_check_interval:
+                return self.zone_check_interval - self.zone_check_timer
+            return PAUSED_WAIT
+        if self.state == 'walk':
+            return 0  # Walking moves a couple of pixels every tick
+        
+        waits = []
+        if self.zone_check_interval:
+            waits.append(self.zone_check_interval - self.zone_check_timer)
+        if self.state == 'idle' and len(self.animations['idle']) == 1:
+            # A single idle frame never changes, only the next AI decision matters
+            waits.append(self.next_action_delay - self.state_timer + 1)
+        else:
+            waits.append(self.frame_duration() - self.frame_timer)
+        for poop in self.poops:
+            waits.append(poop['timer'])
+        return max(0, min(waits))
+    
+    def check_settings(self):
+        """Pick up zones saved by the launcher or another dog"""
+        if self.settings_reader is None:
+            return
+        try:
+            # A stat, and a peek at the revision if the file was touched;
+            # parsed only when someone saved a newer revision
+            settings = self.settings_reader.poll()
+            if settings is not None:
+                self.apply_settings(settings)
+        except Exception as e:
+            print(f"Error checking for zone updates: {e}")
+    
+    def receive_settings(self, settings):
+        """Settings pushed over the control bus, unless the file already gave us them"""
+        if 'zones' not in settings and self.zone_table is None and self.settings_reader is not None:
+            # The zones went to a shared table this process couldn't open
+            self.check_settings()
+            return
+        if self.settings_reader is not None:
+            if settings.get('revision', 0) <= self.settings_reader.revision:
+                return
+            self.settings_reader.seen(settings)
+        try:
+            self.apply_settings(settings)
+        except Exception as e:
+            print(f"Error applying pushed settings: {e}")
+    
+    def apply_settings(self, settings):
+        # Settings without zones (pushed over the bus) mean "look at the shared table"
+        new_zones = settings.get('zones', [])
+        old_index = self.zone_index
+        changed = False
+        if new_zones or self.zone_table is not None:
+            changed = self.set_zones(normalize_zones(new_zones) if new_zones else None, settings.get('revision', 0))
+        
+        if self.trace is not None:
+            if changed and not new_zones:
+                # Replays have no table, they need the zones themselves
+                settings = dict(settings, zones=[list(zone) for zone in self.visible_zones])
+            self.trace.input({'command': 'settings', 'settings': settings})
+        
+        # Other settings changing is no reason to jump
+        if changed:
+            print(f"Zones updated from settings file: {len(self.visible_zones)} zones loaded")
+            self.settle_into_zones(old_index)
+        
+        stay_on_top = settings.get('stay_on_top', True)
+        if stay_on_top != self.stay_on_top:
+            self.stay_on_top = stay_on_top
+            if self.hwnd is not None:
+                try:
+                    set_window_topmost(self.hwnd, stay_on_top)
+                except Exception as e:
+                    print(f"Could not change always-on-top: {e}")
+    
+    def settle_into_zones(self, old_index):
+        """After the zones changed, only jump if this dog is no longer in one
+
+        A dog still inside a zone stays where it is; if its own zone (same
+        place in the list) was moved up or down but still spans its x, it
+        steps onto the new floor. Only dogs left outside every zone teleport,
+        to the nearest walkable spot, so an edit elsewhere on screen doesn't
+        set off every portal at once.
+        """
+        # Before the jump only the landing spot matters (in portal_in it has landed)
+        in_flight = self.teleporting and self.state == 'portal_out'
+        if in_flight:
+            x, y = self.teleport_target_x, self.teleport_target_y
+        else:
+            x, y = self.x, self.y
+        if self.zone_index.on_floor(x, y):
+            return
+        
+        i = old_index.zone_at(x, y)
+        if i is not None and i < len(self.zone_index):
+            low, high, stand_y = self.zone_index.placements[i]
+            if low <= x <= high:
+                if in_flight:
+                    self.teleport_target_y = stand_y
+                else:
+                    self.y = stand_y
+                    self.move_window(self.x, self.y)
+                return
+        
+        # Off every floor: to the nearest spot that is still walkable
+        target = self.zone_index.nearest(x)
+        if target is None:
+            return
+        if in_flight:
+            self.teleport_target_x, self.teleport_target_y = target
+            return
+        
+        print("Zones changed - teleporting to the nearest zone...")
+        self.teleport_to(target)
+    
+    def set_zones(self, zones, revision):
+        """Take over zones saved as settings revision, returns True if they changed
+
+        On the shared table zones may be None: just check whether someone
+        else published new ones.
+        """
+        if self.zone_table is None:
+            changed = zones != self.visible_zones
+            self.visible_zones = zones
+        else:
+            if zones is not None:
+                # Usually whoever saved has published them already and this is a
+                # no-op. Revisions only go backwards when the file was replaced
+                reset = (settings_store.peek_revision(SETTINGS_FILE) or 0) < self.zone_table.revision
+                self.zone_table.publish(zones, revision, force=reset)
+            sequence = self.zone_table.sequence
+            changed = sequence != self.zones_seen
+            self.zones_seen = sequence
+        
+        if changed:
+            self.zone_index = ZoneIndex.compile(self.visible_zones)
+        return changed
+    
+    def update(self, dt):
+        if self.trace is not None:
+            self.trace.update(self, dt)
+        
+        # Without change notifications, poll for zone updates (see zone_check_interval)
+        if self.zone_check_interval:
+            self.zone_check_timer += dt
+            if self.zone_check_timer >= self.zone_check_interval:
+                self.zone_check_timer = 0
+                self.check_settings()
         
-        if self.frame_timer >= frame_duration:
+        if self.paused:
+            return
+        
+        self.frame_timer += dt
+        self.state_timer += dt
+        
+        if self.frame_timer >= self.frame_duration():
             self.frame_timer = 0
             self.frame += 1
             
@@ -824,7 +1944,7 @@ class Dog:
                 weights = ['walk', 'trick']
                 probs = [60, 25]
                 
-                if len(self.visible_zones) > 1:
+                if len(self.zone_index) > 1:
                     weights.append('teleport')
                     probs.append(15)
                 else:
@@ -832,13 +1952,16 @@ class Dog:
                     probs[0] += 10 # Walk 70%
                     probs[1] += 5  # Trick 30%
                 
-                action = random.choices(weights, weights=probs, k=1)[0]
-                print(f"Action selected: {action}")
+                action = self.rng.choices(weights, weights=probs, k=1)[0]
+                log.debug("Action selected: %s", action)
                 
                 if action == 'walk':
-                    self.state = 'walk'
+                    if self.animation_ready('walk'):
+                        self.state = 'walk'
+                        self.direction = self.rng.choice([-1, 1])
+                    else:
+                        SchauzerSprites.prefetch('walk')
                     self.state_timer = 0
-                    self.direction = random.choice([-1, 1])
                 elif action == 'trick':
                     self.do_trick()
                     self.state_timer = 0
@@ -847,34 +1970,27 @@ class Dog:
                     self.state_timer = 0
                 
                 # Pick next delay
-                self.next_action_delay = random.randint(2000, 4000)
+                self.next_action_delay = self.rng.randint(2000, 4000)
 
         elif self.state == 'walk':
             speed = 2
             old_x = self.x
             self.x += speed * self.direction
 
-            in_any_zone = False
-            current_zone_y = self.y
-
-            for zone in self.visible_zones:
-                if len(zone) >= 4:
-                    zone_start, zone_end, zone_y, zone_height = zone[0], zone[1], zone[2], zone[3]
+            # Keep to this floor while it goes on, else step onto the zone
+            # that owns the new x, else turn around
+            if not self.zone_index.on_floor(self.x, self.y):
+                stand_y = self.zone_index.stand_y_for_x(self.x)
+                if stand_y is None:
+                    self.direction *= -1
+                    self.x = old_x
+                    if not self.zone_index.on_floor(self.x, self.y):
+                        # Stranded, no floor either way: step onto the nearest one
+                        spot = self.zone_index.nearest(self.x)
+                        if spot is not None:
+                            self.x, self.y = spot
                 else:
-                    zone_start, zone_end = zone[0], zone[1]
-                    zone_y = GROUND_Y
-                    zone_height = 60
-
-                if zone_start <= self.x <= zone_end - PET_WIDTH:
-                    in_any_zone = True
-                    current_zone_y = zone_y + zone_height - PET_HEIGHT
-                    break
-
-            self.y = current_zone_y
-
-            if not in_any_zone:
-                self.direction *= -1
-                self.x = old_x
+                    self.y = stand_y
 
             if self.x < 0:
                 self.direction = 1
@@ -883,7 +1999,7 @@ class Dog:
                 self.direction = -1
                 self.x = SCREEN_WIDTH - PET_WIDTH
 
-            if self.state_timer > 1500 and random.random() < 0.01:
+            if self.state_timer > 1500 and self.rng.random() < 0.01:
                 self.state = 'idle'
                 self.state_timer = 0
 
@@ -895,123 +2011,517 @@ class Dog:
             if poop['timer'] <= 0:
                 self.poops.remove(poop)
     
+    def current_frame(self):
+        """Surface to show for the current state, frame and facing"""
+        bank = self.mirrored_animations if self.direction == -1 else self.animations
+        frames = bank[self.state]
+        return frames[self.frame % len(frames)]
+    
+    def presentation(self):
+        """(state, frame surface, direction, window position) currently on show"""
+        return (self.state, self.current_frame(), self.direction, (int(self.x), int(self.y)))
+    
     def draw(self):
+        # Idle and held frames (sit_2, poop_2) look the same tick after tick
+        presented = self.presentation()
+        if presented == self.last_presented:
+            return
+        self.last_presented = presented
+        
         self.screen.fill(TRANSPARENT)
-
-        frames = self.animations[self.state]
-        frame_img = frames[self.frame % len(frames)]
-
-        if self.direction == -1 and self.state not in['backflip', 'portal_out', 'portal_in']:
-            frame_img = pygame.transform.flip(frame_img, True, False)
-
-        self.screen.blit(frame_img, (0, 0))
+        self.screen.blit(presented[1], (0, 0))
         
         # DEBUG: Show state
         # font = pygame.font.SysFont('Arial', 12)
         # text = font.render(self.state, True, (0, 0, 255))
         # self.screen.blit(text, (5, 5))
         
-        pygame.display.flip()
+        if not self.headless:
+            pygame.display.flip()
+            report_first_frame()
+    
+    def handle_event(self, event):
+        """Handle one input event, returns False when this dog should close"""
+        if event.type == pygame.QUIT:
+            return False
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button == 1:  # Left click
+                self.handle_command({'command': 'trick'})
+            elif event.button == 3:  # Right click - show zone editor
+                self.open_zone_editor()
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                return False
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.last_presented = None
+        elif event.type == SETTINGS_CHANGED:
+            self.check_settings()
+        elif event.type == BUS_COMMAND:
+            return self.handle_command(event.message)
+        return True
+    
+    def handle_command(self, message):
+        """Act on one control bus message, returns False when this dog should close"""
+        command = message.get('command')
+        if self.trace is not None and command in ('trick', 'pause', 'resume', 'add_dog'):
+            self.trace.input(message)
+        
+        if command == 'settings':
+            self.receive_settings(message.get('settings') or {})
+        elif command == 'trick':
+            if self.state not in ['backflip', 'poop'] and not self.paused:
+                self.do_trick()
+        elif command == 'pause':
+            self.paused = True
+        elif command == 'resume':
+            self.paused = False
+        elif command == 'add_dog':
+            self.spawn_new_dog()
+        elif command == 'close':
+            return False
+        return True
+    
+    def info(self):
+        """Snapshot for the launcher's list of running dogs"""
+        return {
+            'x': int(self.x), 'y': int(self.y), 'state': self.state,
+            'paused': self.paused, 'zones': len(self.visible_zones),
+            'shown': self.last_presented is not None,
+        }
+    
+    def open_zone_editor(self):
+        """Show the zone editor in its own window, then pick up the result"""
+        try:
+            editor = ZoneEditor(self.visible_zones, self.stay_on_top, separate_window=True)
+            replaced_display = False
+        except Exception as e:
+            # No second-window support: swap the display for the editor, restore it after
+            print(f"Zone editor replaces the dog window: {e}")
+            SchauzerSprites.display_closing()
+            pygame.display.quit()
+            pygame.display.init()
+            editor = ZoneEditor(self.visible_zones, self.stay_on_top)
+            replaced_display = True
+        
+        try:
+            result_zones = editor.run()
+        finally:
+            editor.close()
+        
+        # Check what action was taken
+        if result_zones is not None and editor.result == 'save':
+            # User clicked Save - update zones (the shared table right away,
+            # other processes also hear about it over the control bus)
+            saved = save_settings({'zones': result_zones})
+            print(f"Zones saved: {result_zones}")
+            
+            if self.trace is not None:
+                self.trace.input({'command': 'zones', 'zones': result_zones})
+            old_index = self.zone_index
+            if saved:
+                self.settings_reader.seen(saved)
+                self.set_zones(result_zones, saved['revision'])
+                publish_settings(saved)
+            else:
+                self.visible_zones = result_zones  # Only this dog knows them
+                self.zone_index = ZoneIndex.compile(result_zones)
+            self.settle_into_zones(old_index)
+        
+        # Check if user wants to add another dog
+        spawn_dog = (result_zones is not None and editor.result == 'add_dog')
+        
+        # Recreate dog window (or the host's shared window), or just repaint it
+        if replaced_display:
+            pygame.display.init()
+            if self.host is not None:
+                self.host.create_window()
+            else:
+                self.create_window()
+        elif self.host is not None:
+            self.host.repaint()
+        else:
+            self.last_presented = None
+        
+        restrict_events()
+        self.check_settings()  # The editor swallowed any change notification meanwhile
+        
+        # Handle add dog action after window is recreated
+        if spawn_dog:
+            self.handle_command({'command': 'add_dog'})
     
     def run(self):
         running = True
+        restrict_events()
+        self.draw()  # Show the idle frame before the first wait
         
         while running:
-            dt = self.clock.tick(60)
+            # Sleep until the next frame change, AI decision or input
+            wait = self.time_until_update()
+            events = wait_for_events(wait)
+            dt = self.clock.tick(FPS)
+            started = time.perf_counter()
             
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+            for event in events:
+                if not self.handle_event(event):
                     running = False
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    if event.button == 1:  # Left click
-                        if self.state not in ['backflip', 'poop']:
-                            self.do_trick()
-                    elif event.button == 3:  # Right click - show zone editor
-                        #Save current position
-                        save_x, save_y = self.x, self.y
-                        
-                        # Close current display to show editor
-                        pygame.display.quit()
-                        pygame.display.init()
-                        
-                        # Show zone editor
-                        editor = ZoneEditor(self.visible_zones, self.stay_on_top)
-                        result_zones = editor.run()
-                        
-                        # Check what action was taken
-                        if result_zones is not None and editor.result == 'save':
-                            # User clicked Save - update zones
-                            self.visible_zones = result_zones
-                            settings = load_settings()
-                            settings['zones'] = result_zones
-                            save_settings(settings)
-                            print(f"Zones saved: {result_zones}")
-                            
-                            # Force immediate teleport to new zones (with animation)
-                            if os.path.exists(SETTINGS_FILE):
-                                self.settings_mtime = os.path.getmtime(SETTINGS_FILE)
-                            self.teleport_to_random_zone()
-                        
-                        # Check if user wants to add another dog
-                        spawn_dog = (result_zones is not None and editor.result == 'add_dog')
-                        
-                        # Recreate dog window
-                        pygame.display.init()
-                        os.environ['SDL_VIDEO_WINDOW_POS'] = f'{int(save_x)},{int(save_y)}'
-                        self.screen = pygame.display.set_mode((PET_WIDTH, PET_HEIGHT), pygame.NOFRAME)
-                        
-                        # Reapply window properties
-                        try:
-                            import ctypes
-                            hwnd = pygame.display.get_wm_info()['window']
-                            
-                            GWL_EXSTYLE = -20
-                            WS_EX_LAYERED = 0x00080000
-                            WS_EX_TOOLWINDOW = 0x00000080
-                            LWA_COLORKEY = 0x00000001
-                            
-                            style = ctypes.windll.user32.GetWindowLongW(hwnd, GWL_EXSTYLE)
-                            style = style | WS_EX_LAYERED | WS_EX_TOOLWINDOW
-                            ctypes.windll.user32.SetWindowLongW(hwnd, GWL_EXSTYLE, style)
-                            
-                            ctypes.windll.user32.SetLayeredWindowAttributes(
-                                hwnd,
-                                0x00FF00FF,
-                                0,
-                                LWA_COLORKEY
-                            )
-                            
-                            HWND_TOPMOST = -1
-                            SWP_NOMOVE = 0x0002
-                            SWP_NOSIZE = 0x0001
-                            SWP_NOACTIVATE = 0x0010
-                            
-                            if self.stay_on_top:
-                                ctypes.windll.user32.SetWindowPos(
-                                    hwnd, HWND_TOPMOST, 0, 0, 0, 0,
-                                    SWP_NOMOVE | SWP_NOSIZE | SWP_NOACTIVATE
-                                )
-                            
-                            self.hwnd = hwnd
-                        except:
-                            pass
-                        
-                        # Handle add dog action after window is recreated
-                        if spawn_dog:
-                            self.spawn_new_dog()
-                            
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        running = False
             
             self.update(dt)
             self.draw()
+            self.loop_stats.record(wait, dt, (time.perf_counter() - started) * 1000)
+        
+        self.stop_trace()
+        stop_control_bus()
+        pygame.quit()
+        sys.exit()
+    
+    def replay_input(self, message):
+        """Apply an input recorded in a trace the way it first arrived (see dog_trace.py)"""
+        if message.get('command') == 'settings':
+            self.apply_settings(message['settings'])
+        elif message.get('command') == 'zones':
+            # Saved from this dog's zone editor
+            if self.trace is not None:
+                self.trace.input(message)
+            old_index = self.zone_index
+            self.set_zones(message['zones'], 0)
+            self.settle_into_zones(old_index)
+        else:
+            self.handle_command(message)
+    
+    def stop_trace(self):
+        """Finish the trace, if any, with a checkpoint of where this dog ended up"""
+        if self.trace is not None:
+            self.trace.close(self)
+            self.trace = None
+    
+    def simulate(self, duration, draw=False):
+        """Run the main loop for duration simulated ms, without waiting; returns the update count
+
+        Needs a SimClock (headless dogs get one). Steps the way run() does: a
+        frame at a time while something moves, straight to the next deadline
+        while nothing does.
+        """
+        end = self.clock.now + duration
+        updates = 0
+        while self.clock.now < end:
+            self.clock.wait(min(self.time_until_update(), end - self.clock.now))
+            self.update(self.clock.tick(FPS))
+            if draw:
+                self.draw()
+            updates += 1
+        return updates
+
+
+class DogHost:
+    """Runs many dogs in one process
+
+    All dogs share one sprite cache and one transparent overlay window that
+    covers the screen, so adding a dog creates an entity instead of starting
+    another interpreter. Without colour-key transparency (see
+    overlay_supported) it starts one process per dog instead and exits.
+    """
+    
+    def __init__(self, count=1):
+        settings = load_settings()
+        self.stay_on_top = settings.get('stay_on_top', True)
+        self.count = max(1, count)
+        self.dogs = []
+        self.focus = None  # Last clicked dog receives key presses
+        self.clock = pygame.time.Clock()
+        self.loop_stats = LoopStats()
+        self.hwnd = None
+        self.create_window()
+        
+        # One bus endpoint for the whole host, 'info' lists every dog in it
+        self.on_bus = start_control_bus('host', lambda: {
+            'dogs': [dog.info() for dog in list(self.dogs)], 'loop': self.loop_stats.snapshot()})
+        
+        for _ in range(self.count):
+            self.add_dog()
+    
+    def create_window(self):
+        """Open (or reopen after the zone editor) the shared overlay window"""
+        if not overlay_supported():
+            self.fall_back_to_processes("no colour-key transparency on this platform")
+        os.environ['SDL_VIDEO_WINDOW_POS'] = '0,0'
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.NOFRAME)
+        pygame.display.set_caption("Schnauzer Pets")
+        SchauzerSprites.convert_for_display()
+        
+        try:
+            self.hwnd = apply_window_styles(self.stay_on_top)
+        except Exception as e:
+            if os.name == 'nt':
+                self.fall_back_to_processes(f"the overlay can't be made transparent ({e})")
+            print(f"Compatibility mode: {e}")  # Offscreen driver, nothing to see through
+            self.hwnd = None
+        
+        self.repaint()
+    
+    def fall_back_to_processes(self, reason):
+        """Start every dog (or the ones asked for) as its own process and exit"""
+        print(f"Host mode unavailable: {reason}; starting one process per dog")
+        positions = [(int(dog.x), int(dog.y)) for dog in self.dogs]
+        if not positions:
+            zones = shared_zones() or load_settings().get('zones', [])
+            positions = [pick_spawn_position(zones) or (100, GROUND_Y) for _ in range(self.count)]
+        stop_control_bus()
+        pygame.quit()
+        for x, y in positions:
+            spawn_dog_process(x, y)
+        sys.exit()
+    
+    def repaint(self):
+        """Clear the overlay; every dog draws itself again on the next draw()"""
+        self.screen.fill(TRANSPARENT)
+        pygame.display.flip()
+        self.erase_rects = []
+        for dog in self.dogs:
+            dog.last_presented = None
+    
+    def add_dog(self, x=None, y=None):
+        """Add a dog entity; without a position it lands somewhere random in a zone"""
+        if x is None or y is None:
+            position = None
+            if self.dogs:
+                position = pick_spawn_position(shared_zones() or load_settings().get('zones', []))
+            if position is not None:
+                x, y = position
+        dog = Dog(x, y, host=self)
+        self.dogs.append(dog)
+        print(f"Added dog {len(self.dogs)} at ({dog.x}, {dog.y})")
+        return dog
+    
+    def remove_dog(self, dog):
+        if dog in self.dogs:
+            self.dogs.remove(dog)
+            dog.stop_trace()
+            if dog.last_presented is not None:
+                x, y = dog.last_presented[3]
+                self.erase_rects.append(pygame.Rect(x, y, PET_WIDTH, PET_HEIGHT))
+        if self.focus is dog:
+            self.focus = None
+    
+    def dog_at(self, pos):
+        """Topmost dog with a visible pixel under the given screen position"""
+        px, py = pos
+        for dog in reversed(self.dogs):
+            local_x = px - int(dog.x)
+            local_y = py - int(dog.y)
+            if 0 <= local_x < PET_WIDTH and 0 <= local_y < PET_HEIGHT:
+                color = dog.current_frame().get_at((local_x, local_y))
+                if color.a > 0 and tuple(color)[:3] != TRANSPARENT:
+                    return dog
+        return None
+    
+    def sync_stay_on_top(self):
+        """Follow the dogs when always-on-top was changed in the settings"""
+        if not self.dogs or self.dogs[0].stay_on_top == self.stay_on_top:
+            return
+        self.stay_on_top = self.dogs[0].stay_on_top
+        if self.hwnd is not None:
+            try:
+                set_window_topmost(self.hwnd, self.stay_on_top)
+            except Exception as e:
+                print(f"Could not change always-on-top: {e}")
+    
+    def handle_event(self, event):
+        if event.type == pygame.QUIT:
+            self.dogs = []
+        elif event.type == BUS_COMMAND:
+            command = event.message.get('command')
+            if command == 'add_dog':
+                self.add_dog()
+            elif command == 'close':
+                self.dogs = []
+            else:
+                for dog in self.dogs:
+                    dog.handle_command(event.message)
+                self.sync_stay_on_top()
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            dog = self.dog_at(event.pos)
+            if dog is not None:
+                self.focus = dog
+                if not dog.handle_event(event):
+                    self.remove_dog(dog)
+        elif event.type == pygame.KEYDOWN:
+            if self.focus is not None and not self.focus.handle_event(event):
+                self.remove_dog(self.focus)
+        elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            for dog in self.dogs:
+                dog.last_presented = None
+        elif event.type == SETTINGS_CHANGED:
+            for dog in self.dogs:
+                dog.check_settings()
+            self.sync_stay_on_top()
+    
+    def draw(self):
+        """Redraw only the dogs whose visible frame or position changed"""
+        dirty = self.erase_rects
+        self.erase_rects = []
+        for dog in self.dogs:
+            presented = dog.presentation()
+            if presented == dog.last_presented:
+                continue
+            if dog.last_presented is not None:
+                x, y = dog.last_presented[3]
+                dirty.append(pygame.Rect(x, y, PET_WIDTH, PET_HEIGHT))
+            dirty.append(pygame.Rect(presented[3], (PET_WIDTH, PET_HEIGHT)))
+            dog.last_presented = presented
+        
+        if not dirty:
+            return
+        
+        dog_rects = [pygame.Rect(dog.last_presented[3], (PET_WIDTH, PET_HEIGHT)) for dog in self.dogs]
+        for rect in dirty:
+            # Clipped, so an unchanged dog redrawn here can't cover one above it outside the rect
+            self.screen.set_clip(rect)
+            self.screen.fill(TRANSPARENT, rect)
+            # Dogs overlapping an erased area must be redrawn even if they did not change
+            for i in rect.collidelistall(dog_rects):
+                self.screen.blit(self.dogs[i].last_presented[1], dog_rects[i])
+        self.screen.set_clip(None)
+        pygame.display.update(dirty)
+        report_first_frame()
+    
+    def run(self):
+        restrict_events()
+        self.draw()  # Show every dog before the first wait
+        
+        while self.dogs:
+            # Sleep until the earliest deadline of any dog, or input
+            wait = min(dog.time_until_update() for dog in self.dogs)
+            events = wait_for_events(wait)
+            dt = self.clock.tick(FPS)
+            started = time.perf_counter()
+            
+            for event in events:
+                self.handle_event(event)
+            
+            for dog in list(self.dogs):
+                dog.update(dt)
+            self.draw()
+            self.loop_stats.record(wait, dt, (time.perf_counter() - started) * 1000)
         
+        stop_control_bus()
         pygame.quit()
         sys.exit()
 
 
+ZYGOTE_IDLE_EXIT = 10 * 60  # Seconds without spawns or children before the zygote quits
+
+def spawn_from_zygote(x, y):
+    """Ask the resident zygote to fork a dog at (x, y); False if there is none"""
+    if not hasattr(os, 'fork'):
+        return False
+    try:
+        reply = control_bus.send_to('zygote', {'command': 'spawn', 'x': int(x), 'y': int(y)})
+    except Exception as e:
+        print(f"Zygote unavailable: {e}")
+        return False
+    return bool(reply and reply.get('ok'))
+
+
+def run_zygote():
+    """Stay resident with pygame imported and every frame baked, fork a dog per request
+
+    Linux only. The display is closed before forking (SDL can't be shared
+    across a fork), so a child only opens its window and converts the frames
+    it inherited. Spawn requests arrive over the control bus; the fork
+    happens on the main thread, the only one a child keeps.
+    """
+    import queue
+    import signal
+    
+    SchauzerSprites.load_animations(load_settings().get('backflip_steps', SchauzerSprites.BACKFLIP_STEPS))
+    SchauzerSprites.load_mirrored_animations()
+    # What every dog would otherwise do on its own before the first frame;
+    # the event filter outlives display.quit() since pygame.init() holds SDL's events
+    try:
+        settings_store.libc()
+    except OSError:
+        pass
+    restrict_events()
+    pygame.display.quit()
+    if pygame.mixer.get_init():
+        pygame.mixer.quit()
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)  # Children are reaped automatically
+    
+    requests = queue.Queue()
+    
+    def handle(message):
+        command = message.get('command')
+        if command == 'spawn':
+            reply = queue.Queue(1)
+            requests.put((message.get('x'), message.get('y'), reply))
+            try:
+                return {'ok': True, 'pid': reply.get(timeout=control_bus.REPLY_TIMEOUT)}
+            except queue.Empty:
+                return {'ok': False}
+        elif command == 'close':
+            requests.put(None)
+        elif command == 'info':
+            return {'dogs': []}  # Only its children run dogs
+    
+    endpoint = control_bus.Endpoint('zygote', handle)
+    print(f"Zygote ready after {(time.perf_counter() - START_TIME) * 1000:.0f} ms")
+    
+    children = []
+    last_spawn = time.monotonic()
+    while True:
+        try:
+            request = requests.get(timeout=60)
+        except queue.Empty:
+            children = [pid for pid in children if control_bus.pid_alive(pid)]
+            if not children and time.monotonic() - last_spawn > ZYGOTE_IDLE_EXIT:
+                break
+            continue
+        if request is None:
+            break
+        
+        x, y, reply = request
+        pid = os.fork()
+        if pid == 0:
+            endpoint.abandon()
+            run_forked_dog(x, y)  # Exits through sys.exit, never returns here
+        children.append(pid)
+        last_spawn = time.monotonic()
+        reply.put(pid)
+    
+    endpoint.close()
+    pygame.quit()
+    sys.exit()
+
+
+def run_forked_dog(x, y):
+    """Body of a child forked by the zygote: everything but the window is ready"""
+    global START_TIME
+    import signal
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    os.setsid()  # Independent of the zygote and its terminal
+    START_TIME = time.perf_counter()
+    if 'dog_log' in sys.modules:
+        sys.modules['dog_log'].reopen_after_fork('dog')
+    
+    pygame.display.init()
+    Dog(x, y).run()
+
+
 if __name__ == "__main__":
+    # "--zygote" (Linux) stays resident and forks ready dogs, see run_zygote()
+    if len(sys.argv) > 1 and sys.argv[1] == '--zygote':
+        run_zygote()
+    
+    # "--host [count]" runs every dog inside this one process
+    if len(sys.argv) > 1 and sys.argv[1] == '--host':
+        count = 1
+        try:
+            if len(sys.argv) > 2:
+                count = int(sys.argv[2])
+        except ValueError:
+            pass
+        DogHost(count).run()
+    
     # Get position from command line args if provided
     # Handle both PyInstaller bundle and normal execution
     start_x = None
@@ -1028,4 +2538,3 @@ if __name__ == "__main__":
     
     dog = Dog(start_x, start_y)
     dog.run()
-
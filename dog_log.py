@@ -0,0 +1,179 @@
+"""
+Logging for dog processes that can never block the render loop
+
+print() and logging calls only put a record on a bounded queue; a
+background thread writes them to a size-capped rotating file per process
+(dog-<pid>.log or host-<pid>.log in log_dir()). If the writer falls
+behind, records are dropped and counted instead of making the dog wait,
+and stdout/stderr are replaced so nothing ever ends up in a pipe that
+nobody reads.
+
+SCHNAUZER_LOG_DIR moves the files, SCHNAUZER_LOG_LEVEL=DEBUG adds the
+chatty lines (AI decisions and the like).
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+
+QUEUE_SIZE = 1000
+LOG_MAX_BYTES = 256 * 1024
+LOG_BACKUPS = 2  # So at most 768 KB per process
+MAX_LOG_FILES = 20  # Logs of older processes are pruned beyond this
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+_listener = None
+_parent_logged = False  # Set in a forked child whose parent wrote a log file
+
+
+def log_dir():
+    """Per-user folder for the dog log files"""
+    if os.environ.get('SCHNAUZER_LOG_DIR'):
+        return os.environ['SCHNAUZER_LOG_DIR']
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+        return os.path.join(base, 'SchnauzerPet', 'logs')
+    base = os.environ.get('XDG_STATE_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'state')
+    return os.path.join(base, 'schnauzer_pet')
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Never waits for the writer thread: when the queue is full, records are dropped"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            if self.dropped:
+                self.queue.put_nowait(logging.makeLogRecord({
+                    'name': 'schnauzer.log', 'levelno': logging.WARNING, 'levelname': 'WARNING',
+                    'msg': f"{self.dropped} log lines dropped, the log file could not keep up",
+                }))
+                self.dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogStream:
+    """Stand-in for stdout/stderr that hands complete lines to a logger"""
+
+    encoding = 'utf-8'
+
+    def __init__(self, logger, level):
+        self.logger = logger
+        self.level = level
+        self.pending = ''
+
+    def write(self, text):
+        self.pending += text
+        while '\n' in self.pending:
+            line, self.pending = self.pending.split('\n', 1)
+            if line.strip():
+                self.logger.log(self.level, line.rstrip())
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+def setup(name):
+    """Send this process's logging, stdout and stderr to <log_dir>/<name>-<pid>.log
+
+    Returns the log file path, or None if the folder can't be written (then
+    output is discarded rather than risking a blocked pipe).
+    """
+    global _listener
+    if _listener is not None:
+        return _listener.handlers[0].baseFilename
+
+    # A failing handler must not report through stderr, which leads back here
+    logging.raiseExceptions = False
+    root = logging.getLogger()
+    root.setLevel(os.environ.get('SCHNAUZER_LOG_LEVEL', 'INFO').upper())
+    path = None
+    try:
+        folder = log_dir()
+        os.makedirs(folder, exist_ok=True)
+        prune(folder)
+        path = os.path.join(folder, f"{name}-{os.getpid()}.log")
+        file_handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding='utf-8', delay=True)
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        log_queue = queue.Queue(QUEUE_SIZE)
+        root.addHandler(DroppingQueueHandler(log_queue))
+        _listener = logging.handlers.QueueListener(log_queue, file_handler)
+        _listener.start()
+        atexit.register(stop)
+    except (OSError, ValueError):
+        root.addHandler(logging.NullHandler())
+        path = None
+
+    sys.stdout = LogStream(logging.getLogger('schnauzer.stdout'), logging.INFO)
+    sys.stderr = LogStream(logging.getLogger('schnauzer.stderr'), logging.WARNING)
+    return path
+
+
+def stop():
+    """Write out what is still queued (runs at exit)"""
+    global _listener
+    if _listener is None:
+        return
+    # The end marker needs a free slot; the writer thread is making room
+    for attempt in range(100):
+        try:
+            _listener.stop()
+            break
+        except queue.Full:
+            time.sleep(0.01)
+    _listener = None
+
+
+def _forget_parent_log():
+    # The writer thread did not survive the fork; its queue would only fill up
+    global _listener, _parent_logged
+    if _listener is None:
+        return
+    _listener = None
+    _parent_logged = True
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, DroppingQueueHandler):
+            root.removeHandler(handler)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_parent_log)
+
+
+def reopen_after_fork(name):
+    """In a forked child: start its own log file if the parent had one"""
+    if _parent_logged:
+        setup(name)
+
+
+def prune(folder):
+    """Delete the logs of all but the newest MAX_LOG_FILES processes"""
+    groups = {}
+    for entry in os.scandir(folder):
+        base, ext, rotation = entry.name.partition('.log')
+        if ext and (not rotation or rotation[1:].isdigit()):
+            mtime = entry.stat().st_mtime
+            groups.setdefault(base, []).append((mtime, entry.path))
+
+    newest_first = sorted(groups.values(), key=lambda files: max(files)[0], reverse=True)
+    for files in newest_first[MAX_LOG_FILES:]:
+        for mtime, path in files:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,180 @@
+"""
+Compact binary trace of one dog's behaviour that replays bit for bit
+
+A traced dog writes its seed, starting point and settings, then:
+- the dt of every update, consecutive equal ones run-length encoded;
+- every outside input that changes what it does (new settings or zones,
+  pause/resume, clicks, spawns);
+- a checkpoint (simulated time, state, direction, position) whenever its
+  state or direction changed.
+
+Everything else follows from the seed, so replay() feeds the same seed,
+dts and inputs to a headless dog that traces itself into memory. The run
+is exact if both traces are the same bytes.
+
+Traces come from Dog(trace=path), or from every windowed dog when
+SCHNAUZER_TRACE_DIR is set (dog-<pid>-<seed>.trace there).
+
+Usage: python dog_trace.py <file.trace>   (replays it and compares)
+"""
+import atexit
+import io
+import json
+import os
+import struct
+import sys
+
+MAGIC = b'SDT1'
+HEADER = struct.Struct('<4sQiiI')  # magic, seed, start x, start y, settings JSON length
+TICKS = struct.Struct('<cII')  # b'U', dt, number of updates in a row with that dt
+CHECKPOINT = struct.Struct('<cQBbii')  # b'T', time ms, state, direction, x, y
+INPUT = struct.Struct('<cI')  # b'I', JSON length, then the message
+
+STATES = ('idle', 'walk', 'backflip', 'sit', 'poop', 'portal_out', 'portal_in')
+
+
+class Recorder:
+    """Writes one dog's trace to a path or a binary file object"""
+
+    def __init__(self, target, seed, x, y, settings):
+        if isinstance(target, str):
+            self.file = open(target, 'wb')
+            atexit.register(self.close)
+        else:
+            self.file = target
+        data = json.dumps(settings).encode()
+        self.file.write(HEADER.pack(MAGIC, seed, int(x), int(y), len(data)) + data)
+        self.now = 0  # Sum of the dts so far
+        self.dt = None
+        self.count = 0
+        self.last = None  # (state, direction) at the last checkpoint
+
+    def update(self, dog, dt):
+        """Call at the start of each update: notes what the last one (and any input) changed"""
+        if (dog.state, dog.direction) != self.last:
+            self.checkpoint(dog)
+        if dt != self.dt:
+            self.flush_ticks()
+            self.dt = dt
+        self.count += 1
+        self.now += dt
+
+    def checkpoint(self, dog):
+        self.flush_ticks()
+        self.last = (dog.state, dog.direction)
+        self.file.write(CHECKPOINT.pack(
+            b'T', self.now, STATES.index(dog.state), dog.direction, int(dog.x), int(dog.y)))
+
+    def input(self, message):
+        self.flush_ticks()
+        data = json.dumps(message).encode()
+        self.file.write(INPUT.pack(b'I', len(data)) + data)
+
+    def flush_ticks(self):
+        if self.count:
+            self.file.write(TICKS.pack(b'U', self.dt, self.count))
+        self.dt = None
+        self.count = 0
+
+    def close(self, dog=None):
+        """Write what is pending, plus a last checkpoint if given the dog"""
+        if self.file.closed:
+            return
+        if dog is not None:
+            self.checkpoint(dog)
+        self.flush_ticks()
+        if isinstance(self.file, io.BytesIO):
+            return  # The caller still wants the bytes
+        self.file.close()
+
+
+def read(data):
+    """(header dict, records) from trace bytes
+
+    Records are ('ticks', dt, count), ('input', message) and
+    ('checkpoint', time, state, direction, x, y).
+    """
+    magic, seed, x, y, length = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a dog trace")
+    offset = HEADER.size
+    header = {'seed': seed, 'x': x, 'y': y, 'settings': json.loads(data[offset:offset + length])}
+    offset += length
+
+    records = []
+    while offset < len(data):
+        kind = data[offset:offset + 1]
+        if kind == b'U':
+            _, dt, count = TICKS.unpack_from(data, offset)
+            records.append(('ticks', dt, count))
+            offset += TICKS.size
+        elif kind == b'T':
+            _, time, state, direction, x, y = CHECKPOINT.unpack_from(data, offset)
+            records.append(('checkpoint', time, STATES[state], direction, x, y))
+            offset += CHECKPOINT.size
+        elif kind == b'I':
+            _, length = INPUT.unpack_from(data, offset)
+            offset += INPUT.size
+            records.append(('input', json.loads(data[offset:offset + length])))
+            offset += length
+        else:
+            raise ValueError(f"corrupt trace at byte {offset}")
+    return header, records
+
+
+def replay(data):
+    """Run a trace again on a headless dog; returns the replayed trace's bytes"""
+    import dog_instance
+
+    header, records = read(data)
+    buffer = io.BytesIO()
+    dog = dog_instance.Dog(header['x'], header['y'], headless=True, seed=header['seed'],
+                           settings=header['settings'], trace=buffer)
+    for record in records:
+        if record[0] == 'ticks':
+            for _ in range(record[2]):
+                dog.update(record[1])
+        elif record[0] == 'input':
+            dog.replay_input(record[1])
+    dog.stop_trace()
+    return buffer.getvalue()
+
+
+def first_difference(original, replayed):
+    """Index and both versions of the first record where two traces part, or None"""
+    header_a, records_a = read(original)
+    header_b, records_b = read(replayed)
+    if header_a != header_b:
+        return 'header', header_a, header_b
+    for i in range(max(len(records_a), len(records_b))):
+        a = records_a[i] if i < len(records_a) else None
+        b = records_b[i] if i < len(records_b) else None
+        if a != b:
+            return i, a, b
+    return None
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__.strip().splitlines()[-1])
+        return 2
+    with open(sys.argv[1], 'rb') as f:
+        original = f.read()
+    header, records = read(original)
+    updates = sum(record[2] for record in records if record[0] == 'ticks')
+    checkpoints = sum(1 for record in records if record[0] == 'checkpoint')
+    print(f"Seed {header['seed']}, {updates} updates, {checkpoints} checkpoints, {len(original)} bytes")
+
+    replayed = replay(original)
+    if replayed == original:
+        print("Replays exactly")
+        return 0
+    difference = first_difference(original, replayed)
+    print(f"Replay differs at record {difference[0]}: recorded {difference[1]}, replayed {difference[2]}"
+          if difference else "Replay differs")
+    return 1
+
+
+if __name__ == "__main__":
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    sys.exit(main())
@@ -8,7 +8,10 @@ from tkinter import ttk, messagebox
 import subprocess
 import sys
 import os
-import json
+
+import control_bus
+import settings_store
+import zone_table
 
 # Check for pygame dependency
 def check_pygame():
@@ -59,7 +62,7 @@ class SchnauzerLauncher:
     def __init__(self, root):
         self.root = root
         self.root.title("Schnauzer Desktop Pet")
-        self.root.geometry("500x700")  # Increased height to show full help text
+        self.root.geometry("500x740")  # Increased height to show full help text
         self.root.resizable(False, False)
         
         # Configure colors
@@ -70,8 +73,11 @@ class SchnauzerLauncher:
         
         self.root.configure(bg=self.bg_color)
         
-        # Track running dog processes
+        # Track running dog processes (only ours; the control bus sees every dog)
         self.dog_processes = []
+        self.host_process = None  # Multi-dog host when "one process" mode is on
+        self.zygote_process = None  # Linux: resident process that forks new dogs
+        self.dogs_paused = False
         
         # Load settings
         self.settings = self.load_settings()
@@ -81,6 +87,7 @@ class SchnauzerLauncher:
         
         # Center window
         self.center_window()
+        self.refresh_dog_status()
     
     def load_settings(self):
         """Load settings from file"""
@@ -88,21 +95,35 @@ class SchnauzerLauncher:
             'zones': [[50, 500, 800, 60], [1000, 1800, 800, 60]],
             'stay_on_top': True
         }
-        try:
-            if os.path.exists(SETTINGS_FILE):
-                with open(SETTINGS_FILE, 'r') as f:
-                    return json.load(f)
-        except:
-            pass
-        return default
+        return settings_store.read_settings(SETTINGS_FILE) or default
     
-    def save_settings(self):
-        """Save settings to file"""
+    def save_settings(self, **changes):
+        """Merge only the changed keys into the settings file
+
+        Dogs may have saved zones since we loaded, so everything else is
+        taken from the file rather than overwritten with our copy.
+        """
         try:
-            with open(SETTINGS_FILE, 'w') as f:
-                json.dump(self.settings, f, indent=2)
+            self.settings = settings_store.update_settings(SETTINGS_FILE, changes)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save settings: {e}")
+            return
+        
+        # Dogs read zones from the shared table, update it before telling them
+        # (and leave the zones out of the message, they look at the table)
+        settings = self.settings
+        if 'zones' in changes:
+            table = zone_table.open_table()
+            if table is not None:
+                table.publish(changes['zones'], self.settings.get('revision', 0))
+                table.close()
+                settings = {key: value for key, value in settings.items() if key != 'zones'}
+        
+        # Running dogs get the new settings right away
+        try:
+            control_bus.broadcast({'command': 'settings', 'settings': settings})
+        except Exception as e:
+            print(f"Could not notify running dogs: {e}")
     
     def center_window(self):
         """Center the window on screen"""
@@ -183,7 +204,46 @@ class SchnauzerLauncher:
             command=self.add_dog,
             height=2
         )
-        self.add_dog_btn.pack(fill=tk.X, pady=(0, 20))
+        self.add_dog_btn.pack(fill=tk.X, pady=(0, 10))
+        
+        # Every running dog, including ones spawned by other dogs
+        running_frame = tk.Frame(content_frame, bg=self.bg_color)
+        running_frame.pack(fill=tk.X, pady=(0, 20))
+        
+        self.dog_status_label = tk.Label(
+            running_frame,
+            text="",
+            font=("Arial", 10),
+            bg=self.bg_color,
+            fg="#595959"
+        )
+        self.dog_status_label.pack(side=tk.LEFT)
+        
+        close_all_btn = tk.Button(
+            running_frame,
+            text="✖ Close All",
+            font=("Arial", 10),
+            bg="#ffffff",
+            fg="#262626",
+            relief=tk.SOLID,
+            borderwidth=1,
+            cursor="hand2",
+            command=self.close_all_dogs
+        )
+        close_all_btn.pack(side=tk.RIGHT)
+        
+        self.pause_btn = tk.Button(
+            running_frame,
+            text="⏸ Pause All",
+            font=("Arial", 10),
+            bg="#ffffff",
+            fg="#262626",
+            relief=tk.SOLID,
+            borderwidth=1,
+            cursor="hand2",
+            command=self.toggle_pause
+        )
+        self.pause_btn.pack(side=tk.RIGHT, padx=(0, 5))
         
         # Separator
         separator = ttk.Separator(content_frame, orient='horizontal')
@@ -232,6 +292,22 @@ class SchnauzerLauncher:
         )
         toggle_check.pack(anchor=tk.W)
         
+        # Host Mode Toggle. Its full-screen overlay is only see-through with the
+        # Windows colour key, elsewhere it would cover the desktop in magenta
+        self.host_mode_var = tk.BooleanVar(value=os.name == 'nt' and self.settings.get('host_mode', False))
+        
+        if os.name == 'nt':
+            host_check = tk.Checkbutton(
+                toggle_frame,
+                text="Run all dogs in one process (uses less memory)",
+                variable=self.host_mode_var,
+                font=("Arial", 10),
+                bg=self.bg_color,
+                activebackground=self.bg_color,
+                command=self.toggle_host_mode
+            )
+            host_check.pack(anchor=tk.W)
+        
         # Separator
         separator2 = ttk.Separator(content_frame, orient='horizontal')
         separator2.pack(fill=tk.X, pady=10)
@@ -307,29 +383,8 @@ class SchnauzerLauncher:
                 return
         
         try:
-            # Start dog process
-            if IS_FROZEN:
-                # Running from PyInstaller - use separate DogInstance.exe
-                if not os.path.exists(DOG_EXECUTABLE):
-                    messagebox.showerror(
-                        "Missing File",
-                        f"Cannot find DogInstance.exe.\n\n"
-                        f"Expected location: {DOG_EXECUTABLE}\n\n"
-                        "Make sure all files were extracted from the ZIP."
-                    )
-                    return
-                cmd = [DOG_EXECUTABLE]
-            else:
-                # Running from source - use Python
-                cmd = [PYTHON_EXE, DOG_INSTANCE_SCRIPT]
-            
-            process = subprocess.Popen(
-                cmd,
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            self.dog_processes.append(process)
+            if not self.start_dog():
+                return
             
             # Update button text
             self.launch_btn.config(
@@ -351,6 +406,118 @@ class SchnauzerLauncher:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to launch dog: {e}")
     
+    def get_dog_command(self):
+        """Command line that starts a dog process, or None if the executable is missing"""
+        if IS_FROZEN:
+            # Running from PyInstaller - use separate DogInstance.exe
+            if not os.path.exists(DOG_EXECUTABLE):
+                messagebox.showerror(
+                    "Missing File",
+                    f"Cannot find DogInstance.exe.\n\n"
+                    f"Expected location: {DOG_EXECUTABLE}\n\n"
+                    "Make sure all files were extracted from the ZIP."
+                )
+                return None
+            return [DOG_EXECUTABLE]
+        # Running from source - use Python
+        return [PYTHON_EXE, DOG_INSTANCE_SCRIPT]
+    
+    def start_dog(self):
+        """Start one dog, returns False if nothing could be started"""
+        if self.host_mode_var.get():
+            # Reuse the running host: a new dog is just a new entity in it
+            if self.host_process is not None and self.host_process.poll() is None:
+                for peer in control_bus.registrations():
+                    if peer['pid'] == self.host_process.pid:
+                        reply = control_bus.send(peer, {'command': 'add_dog'})
+                        if reply and reply.get('ok'):
+                            self.schedule_dog_status()
+                            return True
+        
+        cmd = self.get_dog_command()
+        if cmd is None:
+            return False
+
+        # On Linux a resident zygote forks ready dogs; start one for next time
+        if not self.host_mode_var.get() and sys.platform.startswith('linux'):
+            reply = control_bus.send_to('zygote', {'command': 'spawn'})
+            if reply and reply.get('ok'):
+                self.schedule_dog_status()
+                return True
+            self.start_zygote(cmd)
+        
+        # Dogs write their own rotating log files (dog_log.py). Nobody reads
+        # their output here, and a full pipe would freeze them in print()
+        if self.host_mode_var.get():
+            self.host_process = subprocess.Popen(
+                cmd + ["--host"],
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+            self.dog_processes.append(self.host_process)
+            self.schedule_dog_status()
+            return True
+        
+        process = subprocess.Popen(
+            cmd,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        self.dog_processes.append(process)
+        self.schedule_dog_status()
+        return True
+    
+    def start_zygote(self, cmd):
+        """Start the zygote unless one of ours is still starting up"""
+        if self.zygote_process is not None and self.zygote_process.poll() is None:
+            return
+        self.zygote_process = subprocess.Popen(
+            cmd + ["--zygote"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+    
+    def refresh_dog_status(self):
+        """Ask the control bus how many dogs are running right now"""
+        try:
+            dogs = control_bus.list_dogs()
+        except Exception as e:
+            print(f"Could not list running dogs: {e}")
+            dogs = []
+        
+        processes = len(set(pid for pid, info in dogs))
+        if not dogs:
+            text = "No dogs running"
+        elif len(dogs) == 1:
+            text = "1 dog running"
+        else:
+            text = f"{len(dogs)} dogs running in {processes} process{'es' if processes != 1 else ''}"
+        self.dog_status_label.config(text=text)
+        
+        self.dogs_paused = bool(dogs) and all(info.get('paused') for pid, info in dogs)
+        self.pause_btn.config(text="▶ Resume All" if self.dogs_paused else "⏸ Pause All")
+    
+    def schedule_dog_status(self):
+        """Refresh the running dogs line once a new process had time to join the bus"""
+        self.root.after(1500, self.refresh_dog_status)
+    
+    def toggle_pause(self):
+        """Pause or resume every running dog"""
+        control_bus.broadcast({'command': 'resume' if self.dogs_paused else 'pause'})
+        
+        # Dogs act on it in their next loop, so ask again in a moment
+        self.dogs_paused = not self.dogs_paused
+        self.pause_btn.config(text="▶ Resume All" if self.dogs_paused else "⏸ Pause All")
+        self.root.after(300, self.refresh_dog_status)
+    
+    def close_all_dogs(self):
+        """Close every running dog, whoever started it"""
+        control_bus.broadcast({'command': 'close'})
+        self.host_process = None
+        self.schedule_dog_status()
+    
     def reset_launch_button(self):
         """Reset launch button to original state"""
         self.launch_btn.config(
@@ -370,29 +537,8 @@ class SchnauzerLauncher:
             return
         
         try:
-            # Start dog process
-            if IS_FROZEN:
-                # Running from PyInstaller - use separate DogInstance.exe
-                if not os.path.exists(DOG_EXECUTABLE):
-                    messagebox.showerror(
-                        "Missing File",
-                        f"Cannot find DogInstance.exe.\n\n"
-                        f"Expected location: {DOG_EXECUTABLE}\n\n"
-                        "Make sure all files were extracted from the ZIP."
-                    )
-                    return
-                cmd = [DOG_EXECUTABLE]
-            else:
-                # Running from source - use Python
-                cmd = [PYTHON_EXE, DOG_INSTANCE_SCRIPT]
-            
-            process = subprocess.Popen(
-                cmd,
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            self.dog_processes.append(process)
+            if not self.start_dog():
+                return
             
             messagebox.showinfo(
                 "Dog Added!",
@@ -410,6 +556,7 @@ class SchnauzerLauncher:
             
             # Close this window temporarily
             self.root.withdraw()
+            self.settings = self.load_settings()  # Pick up zones a dog saved meanwhile
             
             # Open zone editor
             editor = dog_instance.ZoneEditor(
@@ -424,8 +571,7 @@ class SchnauzerLauncher:
             
             if result is not None:
                 # Save zones
-                self.settings['zones'] = result
-                self.save_settings()
+                self.save_settings(zones=result)
                 
                 messagebox.showinfo(
                     "Zones Saved!",
@@ -440,15 +586,18 @@ class SchnauzerLauncher:
     
     def toggle_always_on_top(self):
         """Toggle always on top setting"""
-        self.settings['stay_on_top'] = self.always_on_top_var.get()
-        self.save_settings()
+        self.save_settings(stay_on_top=self.always_on_top_var.get())
         
         status = "enabled" if self.always_on_top_var.get() else "disabled"
         messagebox.showinfo(
             "Setting Updated",
             f"'Always on top' has been {status}.\n"
-            "This will apply to newly launched dogs."
+            "Running dogs switch over right away."
         )
+    
+    def toggle_host_mode(self):
+        """Toggle running every dog inside one shared process"""
+        self.save_settings(host_mode=self.host_mode_var.get())
 
 
 def main():
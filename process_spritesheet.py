@@ -1,10 +1,11 @@
 import pygame
 import os
 import math
+import schnauzer_art
 
 # Path to the uploaded image
 image_path = r"C:/Users/HullingerLandon/.gemini/antigravity/brain/cc198623-47eb-48ec-bbd0-86036398463b/uploaded_image_1765589543621.png"
-output_file = "schnauzer_art.py"
+output_file = schnauzer_art.ART_FILE
 
 def process():
     if not os.path.exists(image_path):
@@ -66,56 +67,25 @@ def process():
             cell_x = c * grid_w
             cell_y = r * grid_h
             
-            pixels = []
+            # Copy the cell out exactly (BLEND_RGBA_MAX onto a cleared surface);
+            # parts hanging off the sheet edge stay transparent
+            cell = pygame.Surface((grid_w, grid_h), pygame.SRCALPHA)
+            cell.fill((0, 0, 0, 0))
+            cell.blit(img, (0, 0), (cell_x, cell_y, grid_w, grid_h), special_flags=pygame.BLEND_RGBA_MAX)
+            rgba = bytearray(pygame.image.tostring(cell, 'RGBA'))
             
-            for y in range(grid_h):
-                for x in range(grid_w):
-                    px = cell_x + x
-                    py = cell_y + y
-                    
-                    if px >= width or py >= height: continue
-                    
-                    color = img.get_at((px, py))
-                    
-                    # Transparency check
-                    if has_alpha and color.a < 20: 
-                        continue
-                        
-                    pixels.append((x, y, (color.r, color.g, color.b)))
+            # Transparency check: faint pixels are dropped, the rest are drawn solid
+            rgba[3::4] = bytes(255 if a >= 20 else 0 for a in rgba[3::4])
             
-            if not pixels: continue
-            if len(pixels) < 20: continue # Empty frame
+            if rgba[3::4].count(255) < 20: continue # Empty frame
 
             frame_key = f"{anim_name}_{c}"
-            frames_data[frame_key] = pixels
-            # print(f"  Extracted {frame_key}: {len(pixels)} pixels")
+            frames_data[frame_key] = bytes(rgba)
 
     print(f"Total frames: {len(frames_data)}")
     
     # Write output
-    with open(output_file, 'w') as f:
-        f.write("import pygame\n\n")
-        f.write("# Generated sprite data from sheet\n")
-        f.write(f"GRID_SIZE = ({grid_w}, {grid_h})\n\n")
-        
-        f.write("FRAMES = {\n")
-        for key, px_list in frames_data.items():
-            f.write(f"    '{key}': [\n")
-            chunk_size = 8
-            for i in range(0, len(px_list), chunk_size):
-                chunk = px_list[i:i+chunk_size]
-                f.write("        " + ", ".join(str(p) for p in chunk) + ",\n")
-            f.write("    ],\n")
-        f.write("}\n\n")
-        
-        f.write("def draw_frame(surface, anim_name, frame_idx, x, y, scale=1):\n")
-        f.write("    key = f'{anim_name}_{frame_idx}'\n")
-        f.write("    if key not in FRAMES:\n")
-        f.write("        return\n")
-        f.write("\n")
-        f.write("    pixels = FRAMES[key]\n")
-        f.write("    for px, py, color in pixels:\n")
-        f.write("        pygame.draw.rect(surface, color, (x + px*scale, y + py*scale, scale, scale))\n")
+    schnauzer_art.write_pack(output_file, frames_data, (grid_w, grid_h))
 
     print(f"Done. Saved to {output_file}")
     pygame.quit()
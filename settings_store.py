@@ -0,0 +1,220 @@
+"""
+Settings file shared by the launcher and every dog
+
+Writes go to a temp file that replaces schnauzer_settings.json in one step,
+so a reader never sees half a file. Read-modify-write happens under an
+advisory lock (<settings>.lock) and merges keys, so the launcher and a dog
+saving at the same time don't clobber each other. Every write bumps a
+'revision' number stored first in the file; dogs stat the file and peek at
+that number, and only parse the JSON when it actually advanced.
+
+On Linux, watch() gets inotify events for the file instead, so changes
+arrive within milliseconds and nobody has to wake up to poll.
+"""
+import contextlib
+import json
+import os
+import re
+import struct
+import sys
+import threading
+import time
+
+LOCK_TIMEOUT = 5.0  # Seconds to wait for another writer before giving up
+REVISION_PATTERN = re.compile(rb'\{\s*"revision"\s*:\s*(\d+)')
+
+# From <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, name length
+
+_libc = None
+
+
+@contextlib.contextmanager
+def locked(path, timeout=LOCK_TIMEOUT):
+    """Hold the advisory lock for path (a separate .lock file, never replaced)"""
+    lock_file = open(f"{path}.lock", 'a+b')
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if os.name == 'nt':
+                    import msvcrt
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+                else:
+                    import fcntl
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Settings are locked by another process ({path}.lock)")
+                time.sleep(0.01)
+
+        yield
+    finally:
+        lock_file.close()  # Closing releases the lock on both platforms
+
+
+def stat_signature(path):
+    """Cheap change check: (mtime, size, file id), or None if the file is missing"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def peek_revision(path):
+    """Revision number from the start of the file without parsing it, or None"""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(64)
+    except OSError:
+        return None
+    match = REVISION_PATTERN.match(head)
+    return int(match.group(1)) if match else None
+
+
+def read_settings(path):
+    """Parsed settings dict, or None if the file is missing or unreadable"""
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def write_atomic(path, data):
+    """Write data as JSON through a temp file and an atomic replace"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+
+    # Windows refuses to replace a file someone has open for a moment; retry briefly
+    for attempt in range(50):
+        try:
+            os.replace(tmp_path, path)
+            return
+        except PermissionError:
+            if attempt == 49:
+                os.remove(tmp_path)
+                raise
+            time.sleep(0.01)
+
+
+def update_settings(path, changes):
+    """Merge changes into the settings file and bump its revision
+
+    Returns the merged settings as written.
+    """
+    with locked(path):
+        current = read_settings(path) or {}
+        merged = {'revision': current.pop('revision', 0) + 1}
+        merged.update(current)
+        merged.update((key, value) for key, value in changes.items() if key != 'revision')
+        write_atomic(path, merged)
+    return merged
+
+
+class SettingsReader:
+    """Remembers the last revision a dog has seen and re-reads only when it advanced"""
+
+    def __init__(self, path):
+        self.path = path
+        self.revision = -1
+        self.signature = None
+
+    def read(self):
+        """Read the file now (None if missing or unreadable) and remember its revision"""
+        self.signature = stat_signature(self.path)
+        data = read_settings(self.path)
+        if data is not None:
+            self.revision = data.get('revision', 0)
+        return data
+
+    def poll(self):
+        """New settings if the file changed since the last read, else None"""
+        signature = stat_signature(self.path)
+        if signature is None or signature == self.signature:
+            return None
+        self.signature = signature
+
+        # Revisions only go up, so the same number means nothing new. A lower
+        # one means the file was replaced from scratch and is read again
+        revision = peek_revision(self.path)
+        if revision is not None and revision == self.revision:
+            return None
+        return self.read()
+
+    def seen(self, settings):
+        """Record a revision this process wrote itself so poll() doesn't report it back"""
+        self.revision = settings.get('revision', 0)
+        self.signature = None
+
+
+def libc():
+    """The C library through ctypes, looked up once (find_library runs ldconfig)"""
+    global _libc
+    if _libc is None:
+        import ctypes
+        import ctypes.util
+        _libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    return _libc
+
+
+def watch(path, callback):
+    """Call callback (on a background thread) whenever path is rewritten or replaced
+
+    Linux only, through inotify; returns False where that isn't available so
+    the caller can keep polling.
+    """
+    if not sys.platform.startswith('linux'):
+        return False
+
+    folder, name = os.path.split(os.path.abspath(path))
+    try:
+        import ctypes
+        c = libc()
+        fd = c.inotify_init1(os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        
+        # Watch the folder: an atomic replace gives the file a new inode, which
+        # a watch on the file itself would not follow
+        if c.inotify_add_watch(fd, folder.encode(), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            error = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(error, f"inotify_add_watch failed for {folder}")
+    except (OSError, AttributeError) as e:
+        print(f"No file change notifications ({e}), polling settings instead")
+        return False
+
+    thread = threading.Thread(target=_read_inotify, args=(fd, name.encode(), callback), daemon=True)
+    thread.start()
+    return True
+
+
+def _read_inotify(fd, name, callback):
+    while True:
+        try:
+            data = os.read(fd, 4096)  # Blocks until something in the folder changes
+        except OSError as e:
+            print(f"Settings watch stopped: {e}")
+            return
+
+        # One callback per batch, however many events mention the file
+        changed = False
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = IN_EVENT_HEADER.unpack_from(data, offset)
+            offset += IN_EVENT_HEADER.size
+            if data[offset:offset + length].rstrip(b'\0') == name:
+                changed = True
+            offset += length
+        if changed:
+            callback()
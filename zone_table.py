@@ -0,0 +1,222 @@
+"""
+Walking zones in one shared memory block for every dog process
+
+The settings file stays the place zones are saved to, but whoever saves
+also publishes them here and leaves the zones out of the bus message, so a
+zone change costs each dog one read of the block instead of parsing JSON.
+Each process keeps one snapshot of the rows, read again only when the
+sequence moves. The file is still parsed when its revision advances
+without a broadcast (a hand edit, a missed message). Layout (little endian):
+
+    header  magic 'SZT1', capacity, sequence (u64), revision (u64), count
+    rows    capacity x (x1, x2, y, height) as int32
+
+Writers hold zones.lock in the bus folder and bump the sequence to odd
+before touching the rows and back to even after (a seqlock); readers retry
+when the sequence was odd or moved while they read. A writer that died
+mid-write leaves the sequence odd for good: readers give up after
+READ_TIMEOUT and use their fallback (the settings file), and the next
+publish() rewrites the block. 'revision' is the
+settings revision the rows came from, so an older save never overwrites a
+newer one. Dogs publish what they read from the file too, so a fresh
+block (after a reboot) fills itself from the settings.
+"""
+import hashlib
+import os
+import struct
+import time
+from multiprocessing import shared_memory
+
+import control_bus
+import settings_store
+
+MAGIC = b'SZT1'
+HEADER = struct.Struct('<4sIQQI4x')
+ROW = struct.Struct('<4i')
+CAPACITY = 256  # More zones than anyone draws by hand
+READ_TIMEOUT = 0.05  # Seconds a reader waits out a writer; a write takes microseconds
+SIZE = HEADER.size + CAPACITY * ROW.size
+SEQUENCE_OFFSET = 8  # 4s + I, 8-byte aligned so the store is a single write
+
+
+def block_name():
+    if os.name == 'nt':
+        name = 'schnauzer_zones_v1'  # Named mappings are per session already
+    else:
+        name = f'schnauzer_zones_v1_{os.getuid()}'
+    if os.environ.get('SCHNAUZER_BUS_DIR'):
+        # A bus of its own (checks, benchmarks) gets a block of its own too
+        name += '_' + hashlib.sha1(os.path.abspath(control_bus.bus_dir()).encode()).hexdigest()[:8]
+    return name
+
+
+class ZoneTable:
+    """Read-only sequence view of the shared zones: len(), [i], iteration
+
+    Rows come back as (x1, x2, y, height) tuples from the last consistent
+    read of the block; checking for a newer one is an 8-byte read.
+    """
+
+    def __init__(self, shm):
+        self.shm = shm
+        self.buf = shm.buf
+        self.fallback = None  # Returns zones to use while the block is torn
+        self._rows = ()
+        self._rows_sequence = None
+
+    @property
+    def sequence(self):
+        """Changes every time the rows change (even when nobody is writing)"""
+        return struct.unpack_from('<Q', self.buf, SEQUENCE_OFFSET)[0]
+
+    @property
+    def revision(self):
+        return HEADER.unpack_from(self.buf)[3]
+
+    def rows(self):
+        """Every zone as a tuple of tuples, retried until no write overlapped
+
+        Gives up after READ_TIMEOUT (a writer died mid-write) and returns
+        the fallback's zones until the sequence moves again.
+        """
+        if self.sequence == self._rows_sequence:
+            return self._rows
+        deadline = time.monotonic() + READ_TIMEOUT
+        while time.monotonic() < deadline:
+            magic, capacity, sequence, revision, count = HEADER.unpack_from(self.buf)
+            if sequence & 1:
+                time.sleep(0)  # Writer in the middle of an update
+                continue
+            rows = self.unpack_rows(count)
+            if self.sequence == sequence:
+                self._rows, self._rows_sequence = rows, sequence
+                return rows
+        
+        print("Shared zone table is stuck mid-write, using the settings file")
+        zones = self.fallback() if self.fallback else ()
+        self._rows = tuple(tuple(int(v) for v in zone[:4]) for zone in zones)
+        self._rows_sequence = self.sequence
+        return self._rows
+
+    def unpack_rows(self, count):
+        end = HEADER.size + min(count, CAPACITY) * ROW.size
+        return tuple(ROW.iter_unpack(self.buf[HEADER.size:end]))
+
+    def __len__(self):
+        return len(self.rows())
+
+    def __getitem__(self, index):
+        return self.rows()[index]
+
+    def __iter__(self):
+        return iter(self.rows())
+
+    def publish(self, zones, revision, force=False):
+        """Replace the rows with zones (x1, x2, y, height) saved as settings revision
+
+        Returns True if the rows changed. Anything not newer than what is
+        already published is ignored (a dog that read the file just before
+        someone saved) unless force is set, for a settings file that was
+        replaced from scratch. The same zones under a newer revision only
+        move the revision, so readers don't see a change.
+        """
+        rows = tuple(tuple(int(v) for v in zone[:4]) for zone in zones[:CAPACITY])
+        with settings_store.locked(lock_path()):
+            magic, capacity, sequence, current, count = HEADER.unpack_from(self.buf)
+            if sequence & 1:
+                # Every writer holds the lock, so a writer died mid-write: rewrite it
+                sequence += 1
+            else:
+                if revision <= current and count and not force:
+                    return False
+                if rows == self.unpack_rows(count):  # No other writer while we hold the lock
+                    HEADER.pack_into(self.buf, 0, MAGIC, CAPACITY, sequence, revision, count)
+                    return False
+
+            # Odd sequence while the rows are inconsistent
+            struct.pack_into('<Q', self.buf, SEQUENCE_OFFSET, sequence + 1)
+            for i, row in enumerate(rows):
+                ROW.pack_into(self.buf, HEADER.size + i * ROW.size, *row)
+            HEADER.pack_into(self.buf, 0, MAGIC, CAPACITY, sequence + 2, revision, len(rows))
+        return True
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
+
+
+def lock_path():
+    return os.path.join(control_bus.bus_dir(), 'zones.lock')
+
+
+def open_table():
+    """Attach to the shared zone block, creating it if this is the first process
+
+    A fresh block is empty with revision 0, the first publish() fills it.
+    Returns None (after printing why) where shared memory isn't available.
+    """
+    os.makedirs(control_bus.bus_dir(), mode=0o700, exist_ok=True)
+    try:
+        try:
+            shm = untracked(create=True, size=SIZE)
+        except FileExistsError:
+            shm = attach()
+        if shm.size < SIZE:
+            shm.close()
+            raise ValueError(f"block is {shm.size} bytes, expected {SIZE}")
+    except (OSError, ValueError) as e:
+        print(f"No shared zone table ({e}), each dog keeps its own zones")
+        return None
+
+    with settings_store.locked(lock_path()):
+        if bytes(shm.buf[:4]) != MAGIC:
+            HEADER.pack_into(shm.buf, 0, MAGIC, CAPACITY, 0, 0, 0)
+    return ZoneTable(shm)
+
+
+def untracked(**kwargs):
+    """SharedMemory kept out of the resource tracker
+
+    The block has to outlive any one dog, and the tracker would unlink it
+    when the process that opened it exits (and start a helper process per
+    dog to do so).
+    """
+    try:
+        return shared_memory.SharedMemory(block_name(), track=False, **kwargs)
+    except TypeError:
+        pass  # Before Python 3.13
+
+    from multiprocessing import resource_tracker
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(block_name(), **kwargs)
+    finally:
+        resource_tracker.register = register
+
+
+def remove_table():
+    """Unlink this bus's block, for checks and benchmarks that made their own"""
+    from multiprocessing import resource_tracker
+    try:
+        shm = untracked()
+    except (FileNotFoundError, ValueError):
+        return
+    shm.close()
+    unregister = resource_tracker.unregister
+    resource_tracker.unregister = lambda name, rtype: None  # It was never registered
+    try:
+        shm.unlink()
+    finally:
+        resource_tracker.unregister = unregister
+
+
+def attach():
+    # The creator may still be sizing the block
+    for attempt in range(50):
+        try:
+            return untracked()
+        except ValueError:
+            if attempt == 49:
+                raise
+            time.sleep(0.01)